@@ -0,0 +1,87 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_NULL = nullcontext()
+
+
+class Profiler:
+    '''
+    mide tiempo (y pico de memoria con tracemalloc) por etapa:
+
+        prof = Profiler(enabled=True)
+        with prof.stage("carga"):
+            ...
+        prof.write("profile.json")   # y "profile.folded" para flamegraphs
+
+    apagado por defecto: stage() regresa un context manager vacío,
+    así que dejarlo en el script no cuesta nada. misma semántica que los
+    profilers de p_02 (profiling.Profiler) y p_03 (double_slit.profiling).
+    '''
+
+    def __init__(self, enabled=False, memory=True):
+        self.enabled = enabled
+        self.memory = memory and enabled
+        self.records = {}  # "etapa;sub-etapa" -> {calls, seconds, child_seconds, peak_bytes}
+        self._stack = []   # [nombre, t0, tiempo de los hijos, pico]
+        self._owns_tracing = False  # si nosotros prendimos tracemalloc, lo apagamos al terminar
+
+    def stage(self, name):
+        return self._stage(name) if self.enabled else _NULL
+
+    @contextmanager
+    def _stage(self, name):
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            if self._stack:  # guardamos el pico del padre antes de reiniciarlo
+                self._stack[-1][3] = max(self._stack[-1][3], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = [name, time.perf_counter(), 0.0, 0]
+        self._stack.append(frame)
+        path = ";".join(f[0] for f in self._stack)
+        rec = self.records.setdefault(path, {"calls": 0, "seconds": 0.0, "child_seconds": 0.0, "peak_bytes": 0})
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            peak = max(frame[3], tracemalloc.get_traced_memory()[1]) if self.memory else 0
+            self._stack.pop()
+            rec["calls"] += 1
+            rec["seconds"] += elapsed
+            rec["child_seconds"] += frame[2]
+            rec["peak_bytes"] = max(rec["peak_bytes"], peak)
+            if self._stack:
+                self._stack[-1][2] += elapsed
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            elif self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    def report(self):
+        return [{"stage": path, "depth": path.count(";"), "calls": r["calls"], "seconds": r["seconds"],
+                 "self_seconds": r["seconds"] - r["child_seconds"], "peak_bytes": r["peak_bytes"]}
+                for path, r in self.records.items()]
+
+    def folded(self):
+        '''pilas colapsadas "etapa;sub <microsegundos propios>" (flamegraph.pl / speedscope)'''
+        return [f"{r['stage']} {max(0, round(r['self_seconds'] * 1e6))}" for r in self.report()]
+
+    def write(self, path):
+        '''
+        escribe el reporte en JSON y, junto a él, las pilas colapsadas (.folded);
+        no imprime nada, para eso está print_summary()
+        '''
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "stages": self.report()}, fh, indent=2)
+        with open(os.path.splitext(path)[0] + ".folded", "w", encoding="utf-8") as fh:
+            fh.write("\n".join(self.folded()) + "\n")
+        return path
+
+    def print_summary(self):
+        for r in self.report():
+            print(f"{'  ' * r['depth']}{r['stage'].rsplit(';', 1)[-1]:<24s} {r['seconds']*1e3:10.2f} ms  "
+                  f"x{r['calls']:<4d} pico {r['peak_bytes'] / 2**20:8.2f} MiB")
@@ -1,6 +1,7 @@
+import argparse
+
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from helper_directory.paths_and_constants import (
     path_0, t_0, paths_todos, paths, tiempos_en_micro_segundos, tiempo_requerido
@@ -8,15 +9,26 @@ from helper_directory.paths_and_constants import (
 
 from helper_directory.load_csv_files import build_original_y_copia
 
-from helper_directory.plotting import fdp_histograma
+from helper_directory.profiling import Profiler
 
-df_0_original = pd.read_csv(path_0, encoding='utf-8')
-df_0_copia = df_0_original.copy(deep=True)
+# "--profile [archivo.json]" mide tiempo y memoria de cada etapa (apagado por defecto)
+# "--no-plots" / "--tables-only" solo imprime los valores (no se importa matplotlib)
+parser = argparse.ArgumentParser(description="conteo de fotones")
+parser.add_argument("--profile", nargs="?", const="profile.json", default=None, metavar="JSON")
+parser.add_argument("--no-plots", "--tables-only", dest="no_plots", action="store_true",
+                    help="sin histogramas")
+args = parser.parse_args()
+prof = Profiler(enabled=args.profile is not None)
+
+with prof.stage("carga_m_0"):
+    df_0_original = pd.read_csv(path_0, encoding='utf-8')
+    df_0_copia = df_0_original.copy(deep=True)
 
 df_0_copia.head()
 
-e_v = df_0_copia.mean()
-e_v = e_v.iloc[0]
+with prof.stage("valor_esperado"):
+    e_v = df_0_copia.mean()
+    e_v = e_v.iloc[0]
 
 print(f"el valor esperado fue de '{e_v:.6f}' fotones a '{t_0} s'")
 
@@ -30,19 +42,39 @@ for i in pruebas:
           f"requerimos de '{tiempo_requerido(i, e_v, escala=escala):.6f}' {escala}segundos \n")
 
 # y creamos los dataframes
-original, copia = build_original_y_copia(paths, encoding='utf-8')
+with prof.stage("carga_muestras"):
+    original, copia = build_original_y_copia(paths, encoding='utf-8')
 print(copia['df_1'].head())
 
+if args.no_plots:
+    if prof.enabled:
+        prof.print_summary()
+        print("perfil escrito en", prof.write(args.profile))
+    raise SystemExit(0)
+
+# matplotlib solo se importa si vamos a graficar
+import matplotlib.pyplot as plt
+
+from helper_directory.plotting import fdp_histograma
+
 # para luego hacer los histogramas, tomamos
-names = list(copia.keys())[:12]
-rows, cols = 3, 4
-fig, axes = plt.subplots(rows, cols, figsize=(cols*4, rows*3), constrained_layout=True)
+with prof.stage("histogramas"):
+    names = list(copia.keys())[:12]
+    rows, cols = 3, 4
+    fig, axes = plt.subplots(rows, cols, figsize=(cols*4, rows*3), constrained_layout=True)
+
+    for ax, name in zip(axes.ravel(), names):
+        fdp_histograma(copia[name], ax=ax, title=name)
+
+    for ax in axes.ravel()[len(names):]:
+        ax.axis("off")
 
-for ax, name in zip(axes.ravel(), names):
-    fdp_histograma(copia[name], ax=ax, title=name)
+    if prof.enabled:
+        fig.canvas.draw()  # para que el render se mida aquí y no durante plt.show()
 
-for ax in axes.ravel()[len(names):]:
-    ax.axis("off")
+if prof.enabled:
+    prof.print_summary()
+    print("perfil escrito en", prof.write(args.profile))
 
 plt.show()
 
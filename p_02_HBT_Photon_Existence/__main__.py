@@ -0,0 +1,3 @@
+from p_02_HBT_Photon_Existence.main import cli
+
+cli()
@@ -0,0 +1,219 @@
+"""
+Stage-by-stage benchmark of the HBT g2 pipeline on generated datasets.
+
+    python -m p_02_HBT_Photon_Existence.benchmark [--sizes small medium large]
+                                                  [--out results.json] [--baseline old.json]
+                                                  [--startup-target 0.5]
+
+Everything runs offline on synthetic trees from synth.generate_dataset.
+For every size and stage it reports wall time (best of --repeat), rows/s,
+files/s and tracemalloc peak memory, and writes the results as JSON. With
+--baseline, each stage is compared against a previous JSON file.
+
+It also times CLI startup (`python -m p_02_HBT_Photon_Existence --help` in a
+fresh interpreter, minus a bare interpreter) against --startup-target seconds,
+and records whether importing the pipeline pulls in matplotlib or scipy.
+"""
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from p_02_HBT_Photon_Existence.config import OUT_DIR
+from p_02_HBT_Photon_Existence.g2 import G2Analyzer
+from p_02_HBT_Photon_Existence.io_utils import (
+    find_all_csvs, read_csv_flexible, probe_csv_header, read_csv_body,
+    normalize_cols, normalize_col_name, detect_dataset_type, find_g2_column_name, parse_delay_from_path
+)
+from p_02_HBT_Photon_Existence.stats import RunningStats
+from p_02_HBT_Photon_Existence.synth import generate_dataset
+
+# name -> (files per window, rows per file); 7 windows x 2 kinds each
+SIZES = {
+    "small":  (1, 200),
+    "medium": (4, 10_000),
+    "large":  (8, 100_000),
+}
+WINDOWS_NS = (5, 10, 20, 50, 100, 200, 500)
+
+
+def _measure(fn, repeat):
+    """(best wall time in s, tracemalloc peak in bytes, last return value)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()  # separate run: tracing slows allocation-heavy code
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, out
+
+
+def _make_tree(root, size):
+    files_per_window, rows = SIZES[size]
+    for kind in ("2d", "3d"):
+        generate_dataset(root, kind=kind, source="thermal" if kind == "2d" else "heralded",
+                         windows_ns=WINDOWS_NS, files_per_window=files_per_window, rows_per_file=rows)
+    return rows
+
+
+def bench_size(size, repeat=3, plots=True):
+    tmp = tempfile.mkdtemp(prefix=f"hbt_bench_{size}_")
+    try:
+        rows_per_file = _make_tree(tmp, size)
+        paths = find_all_csvs(tmp)
+        n_files = len(paths)
+        n_rows = n_files * rows_per_file
+        analyzer = G2Analyzer(tmp)
+
+        frames = {}
+        def parse_flexible():
+            return [read_csv_flexible(p) for p in paths]
+        def probe():
+            return [probe_csv_header(p) for p in paths]
+        headers = probe()
+        def parse_fast():
+            return [read_csv_body(p, h) for p, h in zip(paths, headers)]
+        def classify():
+            return [(detect_dataset_type([normalize_col_name(c) for c in h["columns"]]), parse_delay_from_path(p))
+                    for p, h in zip(paths, headers)]
+        for p, df in zip(paths, parse_fast()):
+            dfn = normalize_cols(df, copy=False)
+            frames[p] = (dfn, detect_dataset_type(dfn.columns), find_g2_column_name(dfn.columns))
+        def estimate():
+            return [(analyzer._g2_per_sample_counts(dfn, k), analyzer._g2_per_sample_file(dfn, c))
+                    for dfn, k, c in frames.values()]
+        per_sample = estimate()
+        def aggregate():
+            buckets = {"2d": {}, "3d": {}}
+            for p, (arr_c, arr_f) in zip(frames, per_sample):
+                rec = buckets[frames[p][1]].setdefault(parse_delay_from_path(p),
+                                                       {"counts": RunningStats(), "file": RunningStats()})
+                rec["counts"].update(arr_c)
+                rec["file"].update(arr_f)
+            return {k: analyzer._add_normalized(analyzer._collapse_records(b)) for k, b in buckets.items()}
+        tables = aggregate()
+
+        stages = [
+            ("discovery", lambda: find_all_csvs(tmp), n_files, 0),
+            ("parse_flexible", parse_flexible, n_files, n_rows),
+            ("header_probe", probe, n_files, 0),
+            ("parse_c_engine", parse_fast, n_files, n_rows),
+            ("classification", classify, n_files, 0),
+            ("per_sample_estimation", estimate, n_files, n_rows),
+            ("aggregation", aggregate, n_files, n_rows),
+            ("end_to_end_compute_all", analyzer.compute_all, n_files, n_rows),
+        ]
+        if plots:
+            from p_02_HBT_Photon_Existence.plotting import plot_scatter
+            out_png = os.path.join(tmp, "bench.png")  # absolute -> stays out of OUT_DIR
+            stages.append(("plotting", lambda: plot_scatter(tables["2d"], which="file", normalized=True,
+                                                            title="bench", filename=out_png), 1, 0))
+
+        results = {}
+        for name, fn, files, rows in stages:
+            secs, peak, _ = _measure(fn, repeat)
+            results[name] = {
+                "seconds": secs,
+                "files_per_s": files / secs if secs > 0 else None,
+                "rows_per_s": rows / secs if rows and secs > 0 else None,
+                "peak_mem_bytes": peak,
+            }
+        return {"files": n_files, "rows": n_rows, "stages": results}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench_startup(repeat=5, target_s=0.5):
+    """Best-of-repeat CLI startup (s) above a bare interpreter, checked against target_s."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    def best(args):
+        t = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, *args], env=env, check=True, stdout=subprocess.DEVNULL)
+            t = min(t, time.perf_counter() - t0)
+        return t
+    bare = best(["-c", "pass"])
+    cli = best(["-m", "p_02_HBT_Photon_Existence", "--help"])
+    probe = subprocess.run([sys.executable, "-c", "import sys, p_02_HBT_Photon_Existence.main; "
+                            "print(int('matplotlib' in sys.modules), int('scipy' in sys.modules))"],
+                           env=env, check=True, capture_output=True, text=True).stdout.split()
+    return {
+        "seconds": cli - bare,
+        "interpreter_seconds": bare,
+        "target_s": target_s,
+        "meets_target": cli - bare <= target_s,
+        "imports_matplotlib": probe[0] == "1",
+        "imports_scipy": probe[1] == "1",
+    }
+
+
+def compare(current, baseline):
+    """Lines 'size/stage: new vs old (x speedup)' for stages present in both runs."""
+    lines = []
+    for size, res in current["sizes"].items():
+        old = baseline.get("sizes", {}).get(size)
+        if not old:
+            continue
+        for stage, r in res["stages"].items():
+            o = old["stages"].get(stage)
+            if o:
+                lines.append(f"{size:>6s}/{stage:<24s} {r['seconds']*1e3:9.2f} ms vs {o['seconds']*1e3:9.2f} ms "
+                             f"(x{o['seconds'] / r['seconds']:.2f})")
+    new, old = current.get("startup"), baseline.get("startup")
+    if new and old:
+        lines.append(f"{'startup':<31s} {new['seconds']*1e3:9.2f} ms vs {old['seconds']*1e3:9.2f} ms "
+                     f"(x{old['seconds'] / new['seconds']:.2f})")
+    return lines
+
+
+def run(sizes=("small", "medium"), repeat=3, plots=True, startup_target_s=0.5):
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "startup": bench_startup(repeat=max(repeat, 3), target_s=startup_target_s),
+        "sizes": {s: bench_size(s, repeat=repeat, plots=plots) for s in sizes},
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Benchmark the HBT g2 pipeline stages.")
+    ap.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-plots", action="store_true", help="skip the plotting stage")
+    ap.add_argument("--out", default=os.path.join(OUT_DIR, "benchmark.json"),
+                    help="results JSON (machine-specific, git-ignored by default)")
+    ap.add_argument("--baseline", default=None, help="previous JSON to compare against")
+    ap.add_argument("--startup-target", type=float, default=0.5,
+                    help="CLI startup budget in s, above a bare interpreter")
+    args = ap.parse_args()
+
+    res = run(args.sizes, repeat=args.repeat, plots=not args.no_plots, startup_target_s=args.startup_target)
+    st = res["startup"]
+    print(f"== startup: {st['seconds']*1e3:.1f} ms above bare python ({st['interpreter_seconds']*1e3:.1f} ms), "
+          f"target {st['target_s']*1e3:.0f} ms -> {'OK' if st['meets_target'] else 'MISSED'}; "
+          f"matplotlib imported: {st['imports_matplotlib']}, scipy imported: {st['imports_scipy']}")
+    for size, r in res["sizes"].items():
+        print(f"== {size}: {r['files']} files, {r['rows']} rows")
+        for stage, m in r["stages"].items():
+            rps = f"{m['rows_per_s']:.3g} rows/s" if m["rows_per_s"] else ""
+            print(f"  {stage:<24s} {m['seconds']*1e3:9.2f} ms  {m['files_per_s']:9.3g} files/s  "
+                  f"{rps:>16s}  peak {m['peak_mem_bytes'] / 2**20:7.2f} MiB")
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(res, fh, indent=2)
+    print("Saved", args.out)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            print("\n".join(compare(res, json.load(fh))))
@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def _boot_means(arr, n_boot, seed_seq, max_block=10_000_000):
+    """
+    n_boot bootstrap means of arr, resampling intervals with replacement.
+    Replicates are drawn in blocks so the (block, n) index matrix stays below
+    max_block elements. Returns a float array of length n_boot (NaN if arr is empty).
+    """
+    if arr.size == 0:
+        return np.full(n_boot, np.nan)
+    rng = np.random.default_rng(seed_seq)
+    out = np.empty(n_boot)
+    block = max(1, min(n_boot, max_block // arr.size))
+    for start in range(0, n_boot, block):
+        stop = min(n_boot, start + block)
+        idx = rng.integers(0, arr.size, size=(stop - start, arr.size))
+        out[start:stop] = arr[idx].mean(axis=1)
+    return out
+
+
+def _boot_job(args):
+    arr, n_boot, seed_seq = args
+    return _boot_means(arr, n_boot, seed_seq)
+
+
+class G2Bootstrap:
+    """
+    Percentile bootstrap CIs for the by-delay g2 tables, including the
+    uncertainty of the tail used for normalization.
+
+    For every delay the intervals are resampled n_boot times (batched in NumPy).
+    Replicates of different delays are independent, so each replicate column b
+    gives one joint realization of the whole curve; its tail mean (largest
+    tail_k delays) normalizes that same replicate. Percentiles over b then give
+    CIs for the raw and for the tail-normalized means.
+
+    Each (kind, series, delay) draws from its own SeedSequence child of `seed`,
+    so results do not depend on worker count or scheduling.
+    """
+
+    def __init__(self, analyzer, n_boot=2000, ci=0.95, seed=0, workers=1):
+        self.analyzer = analyzer
+        self.n_boot = int(n_boot)
+        self.ci = float(ci)
+        self.seed = seed
+        self.workers = int(workers)
+
+    def _replicates(self, samples, kind, series):
+        """(delays sorted, replicate matrix n_delays x n_boot) for one kind/series."""
+        delays = sorted(samples)
+        root = np.random.SeedSequence(self.seed)
+        # stable child per (kind, series, delay): same seed -> same draws, independent of order
+        key = (int(kind == "3d"), int(series == "file"))
+        seqs = [np.random.SeedSequence(root.entropy, spawn_key=key + (int(round(d * 1000)),))
+                for d in delays]
+        jobs = [(samples[d][series], self.n_boot, sq) for d, sq in zip(delays, seqs)]
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as ex:
+                reps = list(ex.map(_boot_job, jobs))
+        else:
+            reps = [_boot_job(j) for j in jobs]
+        return delays, np.vstack(reps)
+
+    def _ci_columns(self, delays, reps, prefix):
+        lo_q, hi_q = 50 * (1 - self.ci), 50 * (1 + self.ci)
+        cols = {}
+        with np.errstate(invalid="ignore"):
+            cols[f"{prefix}_ci_lo"], cols[f"{prefix}_ci_hi"] = np.nanpercentile(reps, [lo_q, hi_q], axis=1)
+            cols[f"{prefix}_boot_std"] = np.nanstd(reps, axis=1, ddof=1)
+
+            if self.analyzer.normalize:
+                k = min(self.analyzer.tail_k, len(delays))
+                tail = np.nanmean(reps[-k:], axis=0)            # one tail estimate per replicate
+                norm = reps / np.where(tail == 0, np.nan, tail)  # same replicate -> joint uncertainty
+                cols[f"{prefix}_norm_ci_lo"], cols[f"{prefix}_norm_ci_hi"] = np.nanpercentile(norm, [lo_q, hi_q], axis=1)
+                cols[f"{prefix}_norm_boot_std"] = np.nanstd(norm, axis=1, ddof=1)
+        return cols
+
+    # ---------- main API ----------
+    def compute_all(self, kinds=("2d","3d")):
+        """
+        {kind: DataFrame(delay_ns, g2_counts_ci_lo/hi, g2_counts_boot_std,
+        g2_counts_norm_ci_lo/hi, g2_counts_norm_boot_std, and the same for g2_file)}.
+        Merge onto the G2Analyzer tables on "delay_ns".
+        """
+        samples = self.analyzer.collect_samples(kinds)
+        out = {}
+        for kind in kinds:
+            if not samples[kind]:
+                out[kind] = pd.DataFrame(columns=["delay_ns"])
+                continue
+            cols = {}
+            for series in ("counts", "file"):
+                delays, reps = self._replicates(samples[kind], kind, series)
+                cols.update(self._ci_columns(delays, reps, f"g2_{series}"))
+            out[kind] = pd.DataFrame({"delay_ns": np.asarray(delays, dtype=float), **cols})
+        return out
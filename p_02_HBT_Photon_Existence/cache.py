@@ -0,0 +1,105 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class ParsedFileCache:
+    """
+    On-disk cache of parsed sample CSVs (one .npz per source file).
+
+    Each entry stores the normalized numeric columns, the detected dataset kind
+    and the delay parsed from the folder name. An entry is valid while the source
+    file keeps the same size and mtime; with verify_hash=True a size/mtime mismatch
+    falls back to comparing a content hash (e.g. after copying the archive), and
+    the entry is refreshed instead of re-parsed if the bytes are unchanged.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir, verify_hash=False):
+        self.cache_dir = cache_dir
+        self.verify_hash = verify_hash
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ---------- helpers ----------
+    def _entry_path(self, csv_path):
+        key = hashlib.sha1(os.path.abspath(csv_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".npz")
+
+    @staticmethod
+    def _content_hash(csv_path):
+        h = hashlib.sha1()
+        with open(csv_path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    @staticmethod
+    def _stat(csv_path):
+        st = os.stat(csv_path)
+        return int(st.st_size), int(st.st_mtime_ns)
+
+    # ---------- main API ----------
+    def load(self, csv_path):
+        """
+        Return (dfn, kind, delay) from the cache, or None on a miss/stale entry.
+        dfn is None for files whose kind is not '2d'/'3d' (only the kind is kept).
+        """
+        entry = self._entry_path(csv_path)
+        if not os.path.exists(entry):
+            return None
+        try:
+            with np.load(entry, allow_pickle=False) as z:
+                if int(z["version"]) != self.VERSION:
+                    return None
+                size, mtime = self._stat(csv_path)
+                if (int(z["size"]), int(z["mtime_ns"])) != (size, mtime):
+                    if not self.verify_hash or str(z["sha1"]) != self._content_hash(csv_path):
+                        return None
+                    fresh = True
+                else:
+                    fresh = False
+                kind = str(z["kind"])
+                delay = float(z["delay"])
+                delay = None if np.isnan(delay) else delay
+                cols = [str(c) for c in z["columns"]]
+                dfn = pd.DataFrame({c: z[f"col{i}"] for i, c in enumerate(cols)}) if cols else None
+        except (OSError, KeyError, ValueError):
+            return None  # unreadable/partial entry -> treat as a miss
+
+        if fresh:  # same bytes, new stat: re-stamp so the next run hits directly
+            self.store(csv_path, dfn, kind, delay)
+        return dfn, kind, delay
+
+    def store(self, csv_path, dfn, kind, delay):
+        """Write one entry atomically (safe with several worker processes)."""
+        size, mtime = self._stat(csv_path)
+        arrays = {}
+        cols = []
+        if dfn is not None:
+            for c in dfn.columns:
+                col = dfn[c]
+                if pd.api.types.is_numeric_dtype(col):
+                    arrays[f"col{len(cols)}"] = col.to_numpy()
+                    cols.append(c)
+        entry = self._entry_path(csv_path)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(
+                fh,
+                version=self.VERSION,
+                size=size, mtime_ns=mtime,
+                sha1=self._content_hash(csv_path) if self.verify_hash else "",
+                kind=kind,
+                delay=np.nan if delay is None else float(delay),
+                columns=np.array(cols, dtype=str),
+                **arrays,
+            )
+        os.replace(tmp, entry)
+
+    def clear(self):
+        for fname in os.listdir(self.cache_dir):
+            if fname.endswith(".npz"):
+                os.remove(os.path.join(self.cache_dir, fname))
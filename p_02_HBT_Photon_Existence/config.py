@@ -12,6 +12,50 @@ if not os.path.isdir(OUT_DIR):
 NORMALIZE_DEFAULT = True
 NORMALIZE_TAIL_K  = 3   # Use mean of largest K delays to set g2(τ→∞)=1
 
+# Parallel ingestion: number of worker processes for G2Analyzer
+# (1 = serial; 0 = use all cores)
+N_WORKERS = 1
+
+# Out-of-core ingestion: stream each CSV in blocks of this many rows
+# (None = read whole files; set e.g. 1_000_000 for long overnight acquisitions)
+CHUNK_ROWS = None
+
+# Parsed-file cache (.npz per CSV), invalidated by file size/mtime.
+# CACHE_VERIFY_HASH: on a size/mtime mismatch, compare content hashes before re-parsing.
+USE_CACHE = True
+CACHE_DIR = os.path.join(OUT_DIR, "cache")
+CACHE_VERIFY_HASH = False
+
+# Dataset manifest (one index of every CSV: kind, delay, rows, columns, size, mtime).
+# When enabled, G2Analyzer syncs it incrementally and selects files from it.
+USE_MANIFEST  = True
+MANIFEST_PATH = os.path.join(OUT_DIR, "manifest.json")
+
+# Incremental mode: persist per-file/per-delay accumulators between runs and
+# only process new/changed delay folders (tables/figures of unchanged kinds are kept)
+INCREMENTAL = True
+STATE_PATH  = os.path.join(OUT_DIR, "g2_state.json")
+
+# Accidental-coincidence correction (2 detectors): also report g2 with
+# N_acc = NT*NR*tau/T subtracted, using T and tau from each folder's infoMedicion.txt
+ACCIDENTALS_CORRECTION = True
+
+# Singles-rate stability check of the Cuentas (CH 1/2/3) files, run before g2 aggregation.
+# A channel is flagged if its rate drifts by more than STABILITY_DRIFT_TOL (relative, over
+# the run) or its Allan deviation exceeds STABILITY_ADEV_TOL x the Poisson expectation.
+STABILITY_CHECK     = True
+STABILITY_DRIFT_TOL = 0.05
+STABILITY_ADEV_TOL  = 3.0
+
+# Fit g2 vs coincidence window (window_fit.G2WindowFitter) and extrapolate g2(tau->0)
+FIT_WINDOW        = True
+FIT_WINDOW_SERIES = "file"   # "counts" or "file" (normalized values are fitted)
+
+# Bootstrap CIs for raw and tail-normalized g2 (0 = off)
+BOOTSTRAP_N    = 0
+BOOTSTRAP_CI   = 0.95
+BOOTSTRAP_SEED = 12345
+
 # Error bars: "std" (requested) or "sem"
 ERRORBAR_KIND = "std"
 
@@ -31,3 +75,8 @@ XAXIS_LABEL = r'$\tau$'
 YLABEL_G2   = r'$g^{(2)}(\tau)$ (sin normalizar)'
 YLABEL_G2_N = r'$g^{(2)}(\tau)$'
 
+# Batch plotting: worker processes for independent figures, and skip a PNG whose
+# input columns and the style settings above are unchanged since its last render
+PLOT_WORKERS        = 1
+PLOT_SKIP_UNCHANGED = True
+PLOT_STATE_PATH     = os.path.join(OUT_DIR, "plot_state.json")
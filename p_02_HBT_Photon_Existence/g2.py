@@ -1,9 +1,62 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 import numpy as np
 import pandas as pd
 from p_02_HBT_Photon_Existence.io_utils import (
-    read_csv_flexible, normalize_cols, detect_dataset_type,
-    parse_delay_from_path, find_all_csvs, find_g2_column_name
+    probe_csv_header, read_csv_body, iter_csv_chunks, normalize_col_name, normalize_cols, detect_dataset_type,
+    parse_delay_from_path, find_all_csvs, find_g2_column_name, info_for_csv
 )
+from p_02_HBT_Photon_Existence.cache import ParsedFileCache
+from p_02_HBT_Photon_Existence.stats import RunningStats
+from p_02_HBT_Photon_Existence.manifest import DatasetManifest
+
+# kind -> (columns, how many of them are numerator factors). Layout per kind:
+#   coincidences, [herald,] denominator singles...
+#   2d: g2 = NTR / (NT*NR),        valid if NT, NR > 0 and NTR >= 0
+#   3d: g2 = NGTR*NG / (NGT*NGR),  valid if NG, NGT, NGR > 0 and NGTR >= 0
+_COUNTS_KERNEL = {
+    "2d": (("ntr", "nt", "nr"), 1),
+    "3d": (("ngtr", "ng", "ngt", "ngr"), 2),
+}
+
+def g2_counts_kernel(coinc, *others, n_num=1, eps=1e-12):
+    """
+    Per-sample counts-based g2 for both kinds, on raw column arrays (any numeric
+    dtype, no conversion copies): coinc * others[:n_num-1] / (prod(others[n_num-1:]) + eps)
+    over rows where coinc >= 0 and every other column is > 0.
+
+    Products and the ratio are formed in two preallocated float buffers; the only
+    other allocations are the validity mask and the compacted result.
+    """
+    n = len(coinc)
+    if n == 0:
+        return np.array([])
+    valid = np.greater_equal(coinc, 0)
+    tmp = np.empty(n, dtype=bool)
+    for a in others:
+        valid &= np.greater(a, 0, out=tmp)
+
+    num_f, den_f = others[:n_num - 1], others[n_num - 1:]
+    den = np.empty(n, dtype=float)
+    if len(den_f) > 1:
+        np.multiply(den_f[0], den_f[1], out=den, casting="unsafe")  # integer product, then float
+        for a in den_f[2:]:
+            np.multiply(den, a, out=den)
+    else:
+        den[:] = den_f[0]
+    den += eps
+    out = np.empty(n, dtype=float)
+    if num_f:
+        np.multiply(coinc, num_f[0], out=out, casting="unsafe")
+        for a in num_f[1:]:
+            np.multiply(out, a, out=out)
+        np.divide(out, den, out=out)
+    else:
+        np.divide(coinc, den, out=out)
+    return out[valid]
 
 class G2Analyzer:
     """
@@ -11,39 +64,44 @@ class G2Analyzer:
 
     Key features:
     - normalize (bool): if True, create *_norm columns using tail normalization so g2(τ→∞)=1
+    - compute_all(): one scan over data_dir -> {"2d": DataFrame, "3d": DataFrame}
     - compute(kind): kind="2d" or "3d"; returns an aggregated DataFrame by delay with:
         delay_ns,
         g2_counts_mean, g2_counts_std, g2_counts_sem, n_counts,
         g2_file_mean,   g2_file_std,   g2_file_sem,   n_file,
+        (and if accidentals=True, 2d only) g2_counts_corr_mean/std/sem, n_counts_corr
         (and if normalize=True) g2_counts_norm, g2_counts_norm_std/sem,
                                  g2_file_norm,   g2_file_norm_std/sem
     """
 
-    def __init__(self, data_dir, normalize=True, tail_k=3):
+    _RECORD_COLS = [
+        "delay_ns",
+        "g2_counts_mean", "g2_counts_std", "g2_counts_sem", "n_counts",
+        "g2_file_mean",   "g2_file_std",   "g2_file_sem",   "n_file",
+    ]
+    _CORR_COLS = ["g2_counts_corr_mean", "g2_counts_corr_std", "g2_counts_corr_sem", "n_counts_corr"]
+
+    def __init__(self, data_dir, normalize=True, tail_k=3, workers=1, cache_dir=None, cache_verify_hash=False,
+                 chunk_rows=None, manifest_path=None, accidentals=False):
         self.data_dir = data_dir
         self.normalize = normalize       # <— turn normalization on/off here
         self.tail_k = int(max(1, tail_k))
+        self.workers = int(workers) if workers else (os.cpu_count() or 1)  # 1 = serial; 0/None = all cores
+        # parsed-file cache (None = always parse the CSVs)
+        self.cache = ParsedFileCache(cache_dir, verify_hash=cache_verify_hash) if cache_dir else None
+        # out-of-core mode: stream each CSV in blocks of chunk_rows rows (None = whole file)
+        self.chunk_rows = int(chunk_rows) if chunk_rows else None
+        # dataset index (None = walk data_dir on every compute)
+        self.manifest_path = manifest_path
+        # accidentals-corrected counts series (2d), using T and window from infoMedicion.txt
+        self.accidentals = accidentals
 
     # ---------- per-sample estimators ----------
     def _g2_per_sample_counts(self, df_norm, kind):
-        eps = 1e-12
-        if kind == "2d":
-            d = df_norm[["nt","nr","ntr"]].copy()
-            valid = (d["nt"] > 0) & (d["nr"] > 0) & (d["ntr"] >= 0)
-            d = d[valid]
-            if len(d) == 0: return np.array([])
-            return (d["ntr"] / (d["nt"]*d["nr"] + eps)).to_numpy()
-
-        if kind == "3d":
-            d = df_norm[["ng","ngt","ngr","ngtr"]].copy()
-            valid = (d["ng"] > 0) & (d["ngt"] > 0) & (d["ngr"] > 0) & (d["ngtr"] >= 0)
-            d = d[valid]
-            if len(d) == 0: return np.array([])
-            num = (d["ngtr"]*d["ng"]).to_numpy()
-            den = (d["ngt"]*d["ngr"] + eps).to_numpy()
-            return num/den
-
-        return np.array([])
+        spec = _COUNTS_KERNEL.get(kind)
+        if spec is None or not set(spec[0]).issubset(df_norm.columns):
+            return np.array([])
+        return g2_counts_kernel(*(df_norm[c].to_numpy(copy=False) for c in spec[0]), n_num=spec[1])
 
     def _g2_per_sample_file(self, df_norm, g2_col):
         if g2_col is None or g2_col not in df_norm.columns:
@@ -51,28 +109,51 @@ class G2Analyzer:
         arr = df_norm[g2_col].to_numpy(dtype=float)
         return arr[~np.isnan(arr)]
 
-    # ---------- helpers ----------
-    def _summarize(self, arr):
-        arr = arr[~np.isnan(arr)]
-        if arr.size == 0:
-            return np.nan, np.nan, np.nan, 0
-        mean = float(np.mean(arr))
-        std  = float(np.std(arr, ddof=1)) if arr.size > 1 else 0.0
-        sem  = float(std / np.sqrt(arr.size)) if arr.size > 1 else 0.0
-        return mean, std, sem, int(arr.size)
+    def _g2_per_sample_counts_corr(self, df_norm, measurement_time_s, window_ns):
+        """
+        2d counts estimator with accidentals removed, for all rows at once:
+            N_acc = NT*NR*tau/T,  g2 = max(NTR - N_acc, 0) / (NT*NR)
+        (same N_acc and clipping as p_03's CoincidencePreprocessor.subtract_accidentals).
+        """
+        eps = 1e-12
+        if not measurement_time_s or window_ns is None:
+            return np.array([])
+        nt  = df_norm["nt"].to_numpy(dtype=float)
+        nr  = df_norm["nr"].to_numpy(dtype=float)
+        ntr = df_norm["ntr"].to_numpy(dtype=float)
+        valid = (nt > 0) & (nr > 0) & (ntr >= 0)
+        prod = nt[valid] * nr[valid]
+        n_true = np.maximum(ntr[valid] - prod * (window_ns * 1e-9 / measurement_time_s), 0.0)
+        return n_true / (prod + eps)
 
+    def _series_arrays(self, dfn, kind, g2_col, info):
+        """All per-sample series of one (chunk of a) file: {"counts", "file"[, "counts_corr"]}."""
+        out = {
+            "counts": self._g2_per_sample_counts(dfn, kind),
+            "file":   self._g2_per_sample_file(dfn, g2_col),
+        }
+        if self.accidentals and kind == "2d":
+            out["counts_corr"] = self._g2_per_sample_counts_corr(dfn, *info)
+        return out
+
+    # ---------- helpers ----------
     def _collapse_records(self, bucket):
+        """bucket: delay -> {"counts": RunningStats, "file": RunningStats[, "counts_corr": RunningStats]}"""
         rows = []
+        with_corr = any("counts_corr" in dct for dct in bucket.values())
         for delay, dct in bucket.items():
-            counts_vec = np.concatenate(dct["counts"]) if dct["counts"] else np.array([])
-            file_vec   = np.concatenate(dct["file"])   if dct["file"]   else np.array([])
-            c_mean, c_std, c_sem, c_n = self._summarize(counts_vec)
-            f_mean, f_std, f_sem, f_n = self._summarize(file_vec)
-            rows.append({
+            c_mean, c_std, c_sem, c_n = dct["counts"].summary()
+            f_mean, f_std, f_sem, f_n = dct["file"].summary()
+            row = {
                 "delay_ns": float(delay),
                 "g2_counts_mean": c_mean, "g2_counts_std": c_std, "g2_counts_sem": c_sem, "n_counts": c_n,
                 "g2_file_mean":   f_mean, "g2_file_std":   f_std, "g2_file_sem":   f_sem, "n_file":   f_n,
-            })
+            }
+            if with_corr:
+                row.update(zip(self._CORR_COLS, dct.get("counts_corr", RunningStats()).summary()))
+            rows.append(row)
+        if not rows:  # no files of this kind: empty table (callers check .empty)
+            return pd.DataFrame(columns=self._RECORD_COLS)
         df = pd.DataFrame(rows).sort_values("delay_ns")
         return df
 
@@ -95,6 +176,14 @@ class G2Analyzer:
                 df["g2_file_norm_std"] = df["g2_file_std"]  / tail_file
                 df["g2_file_norm_sem"] = df["g2_file_sem"]  / tail_file
 
+        # accidentals-corrected counts (if that series exists)
+        if "g2_counts_corr_mean" in df.columns and df["g2_counts_corr_mean"].notna().any():
+            tail_corr = df.nlargest(min(self.tail_k, len(df)), "delay_ns")["g2_counts_corr_mean"].mean()
+            if tail_corr and tail_corr != 0:
+                df["g2_counts_corr_norm"]     = df["g2_counts_corr_mean"] / tail_corr
+                df["g2_counts_corr_norm_std"] = df["g2_counts_corr_std"]  / tail_corr
+                df["g2_counts_corr_norm_sem"] = df["g2_counts_corr_sem"]  / tail_corr
+
         return df
 
     # ---------- main API ----------
@@ -104,26 +193,262 @@ class G2Analyzer:
         Returns aggregated DataFrame by delay with means/std/sem (and *_norm if normalize=True).
         """
         assert kind in {"2d","3d"}
-        bucket = {}  # delay -> {"counts":[...], "file":[...]}
+        return self.compute_all(kinds=(kind,))[kind]
+
+    def compute_all(self, kinds=("2d","3d")):
+        """
+        Single scan of data_dir: every CSV is read/classified once and dispatched
+        to the bucket of its kind. Returns {kind: aggregated DataFrame}, same
+        schema as compute(kind).
 
-        for csv_path in find_all_csvs(self.data_dir):
-            df  = read_csv_flexible(csv_path)
-            dfn = normalize_cols(df)
-            k   = detect_dataset_type(dfn.columns)
-            if k != kind:
+        Each file is reduced to per-delay RunningStats accumulators, so memory is
+        O(number of delays). With workers > 1 files are parsed in a process pool;
+        accumulators are merged in sorted path order, so the table is identical
+        to the serial one.
+        """
+        kinds = tuple(kinds)
+        assert set(kinds) <= {"2d","3d"}
+        buckets = {k: {} for k in kinds}  # kind -> delay -> {series: RunningStats}
+
+        paths = self._select_paths(kinds)
+        for res in self._map_files(partial(self._process_file, kinds=kinds), paths):
+            if res is None:
                 continue
-            delay = parse_delay_from_path(csv_path)
-            if delay is None:
+            kind, delay, accs = res
+            rec = buckets[kind].setdefault(delay, {})
+            for name, acc in accs.items():
+                rec.setdefault(name, RunningStats()).merge(acc)
+
+        out = {}
+        for kind, bucket in buckets.items():
+            df_out = self._collapse_records(bucket)
+            out[kind] = self._add_normalized(df_out)  # no-op if self.normalize == False
+        return out
+
+    def compute_incremental(self, state_path, kinds=("2d","3d")):
+        """
+        Like compute_all, but per-file and per-delay accumulators are persisted in
+        state_path (JSON) between runs. Only new/changed files are processed (see
+        _file_signature for what counts as a change), removed files are dropped,
+        and only the delays they touch are re-merged; the tables are then rebuilt
+        and re-normalized.
+
+        Returns (tables, changed) where changed = {kind: sorted affected delays};
+        an empty list means that kind's table is unchanged since the last run.
+        Changing the table settings (normalize, tail_k) keeps the accumulators
+        but reports every delay as changed, since all normalized columns move.
+        """
+        kinds = tuple(kinds)
+        assert set(kinds) <= {"2d","3d"}
+        # settings that shape every per-file accumulator: a mismatch discards the state
+        settings = {"kinds": list(kinds), "root": os.path.abspath(self.data_dir),
+                    "accidentals": bool(self.accidentals), "chunk_rows": self.chunk_rows}
+        table_settings = {"normalize": bool(self.normalize), "tail_k": self.tail_k}
+        state = dict(settings, files={}, delays={k: {} for k in kinds})
+        if os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as fh:
+                old = json.load(fh)
+            if all(old.get(k) == v for k, v in settings.items()):
+                state = old
+        tables_stale = state.get("tables") != table_settings
+        state["tables"] = table_settings
+        files = state["files"]  # relative path -> {sig, kind, delay, series: {name: [n, mean, m2]}}
+
+        paths = self._select_paths(kinds)
+        current = {os.path.relpath(p, self.data_dir): p for p in paths}
+        todo = []
+        for rel, p in current.items():
+            sig = self._file_signature(p)
+            e = files.get(rel)
+            if e is None or e.get("sig") != sig:
+                todo.append((rel, p, sig))
+
+        affected = {k: set() for k in kinds}
+        def _touch(e):
+            if e and e.get("kind") in affected:
+                affected[e["kind"]].add(e["delay"])
+
+        for rel in set(files) - set(current):  # removed files
+            _touch(files.pop(rel))
+        for (rel, p, sig), res in zip(todo, self._map_files(partial(self._process_file, kinds=kinds),
+                                                            [t[1] for t in todo])):
+            _touch(files.get(rel))
+            e = {"sig": sig, "kind": None, "delay": None}
+            if res is not None:
+                kind, delay, accs = res
+                e.update(kind=kind, delay=delay, series={name: acc.to_list() for name, acc in accs.items()})
+            files[rel] = e
+            _touch(e)
+
+        if tables_stale:  # every row is re-normalized, report them all
+            for kind in kinds:
+                affected[kind].update(float(d) for d in state["delays"].get(kind, {}))
+
+        # re-merge only affected delays, in sorted path order (same as compute_all)
+        for kind in kinds:
+            per_delay = state["delays"].setdefault(kind, {})
+            for delay in affected[kind]:
+                members = [files[rel] for rel in sorted(files)
+                           if files[rel]["kind"] == kind and files[rel]["delay"] == delay]
+                if not members:  # last file of this delay was removed
+                    per_delay.pop(repr(float(delay)), None)
+                    continue
+                merged = {}
+                for e in members:
+                    for name, st in e["series"].items():
+                        merged.setdefault(name, RunningStats()).merge(RunningStats.from_list(st))
+                per_delay[repr(float(delay))] = {name: acc.to_list() for name, acc in merged.items()}
+
+        tmp = state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        os.replace(tmp, state_path)
+
+        tables = {}
+        for kind in kinds:
+            bucket = {float(d): {name: RunningStats.from_list(st) for name, st in v.items()}
+                      for d, v in state["delays"][kind].items()}
+            tables[kind] = self._add_normalized(self._collapse_records(bucket))
+        return tables, {k: sorted(affected[k]) for k in kinds}
+
+    def collect_samples(self, kinds=("2d","3d")):
+        """
+        Per-sample g2 arrays instead of accumulators (for resampling, e.g. bootstrap):
+        {kind: {delay: {series: ndarray}}} with series "counts", "file" (and "counts_corr").
+        Memory is O(total intervals).
+        """
+        kinds = tuple(kinds)
+        out = {k: {} for k in kinds}
+        paths = self._select_paths(kinds)
+        parts = {}  # (kind, delay) -> {series: [arrays]}, in path order
+        for res in self._map_files(partial(self._sample_file, kinds=kinds), paths):
+            if res is None:
                 continue
+            kind, delay, arrays = res
+            rec = parts.setdefault((kind, delay), {})
+            for name, arr in arrays.items():
+                rec.setdefault(name, []).append(arr)
+        for (kind, delay), rec in parts.items():
+            out[kind][delay] = {name: np.concatenate(v) for name, v in rec.items()}
+        return out
+
+    def _select_paths(self, kinds):
+        """
+        CSV paths to visit: from the manifest if one is set, else all CSVs. The
+        manifest is synced first (a stat per file; only new/changed headers are
+        probed), so files added since it was written are never left out.
+        """
+        if self.manifest_path:
+            manifest = DatasetManifest(self.data_dir, self.manifest_path)
+            if any(manifest.update(save=False)):
+                manifest.save()
+            return manifest.select(kinds)
+        return find_all_csvs(self.data_dir)
+
+    # ---------- per-file work (runs in worker processes when workers > 1) ----------
+    def _sample_file(self, csv_path, kinds):
+        """Like _process_file but returns the raw per-sample arrays."""
+        dfn, kind, delay = self._load_file(csv_path, kinds)
+        if kind not in kinds or delay is None:
+            return None
+        g2_col = find_g2_column_name(dfn.columns)
+        return kind, delay, self._series_arrays(dfn, kind, g2_col, self._info(csv_path))
+
+    def _process_file(self, csv_path, kinds):
+        """
+        Parse + classify one CSV and fold its per-sample g2 values into accumulators.
+        Returns (kind, delay, {series: RunningStats}), or None if the file is
+        skipped. Only the O(1) accumulators leave the worker.
+        """
+        if self.chunk_rows:
+            return self._process_file_chunked(csv_path, kinds)
+
+        dfn, kind, delay = self._load_file(csv_path, kinds)
+        if kind not in kinds or delay is None:
+            return None
+
+        g2_col = find_g2_column_name(dfn.columns)
+        arrays = self._series_arrays(dfn, kind, g2_col, self._info(csv_path))
+        return kind, delay, {name: RunningStats().update(arr) for name, arr in arrays.items()}
+
+    def _process_file_chunked(self, csv_path, kinds):
+        """
+        Out-of-core variant of _process_file: the body is streamed in blocks of
+        chunk_rows rows and each block is folded into the accumulators, so memory
+        is bounded by the chunk size. The parsed-file cache is bypassed (it holds
+        whole columns).
+        """
+        header = probe_csv_header(csv_path)
+        cols  = [normalize_col_name(c) for c in header["columns"]]
+        kind  = detect_dataset_type(cols)
+        delay = parse_delay_from_path(csv_path)
+        if kind not in kinds or delay is None:
+            return None
+
+        g2_col = find_g2_column_name(cols)
+        info = self._info(csv_path)
+        accs = {}
+        for chunk in iter_csv_chunks(csv_path, header, self.chunk_rows):
+            dfn = normalize_cols(chunk, copy=False)
+            for name, arr in self._series_arrays(dfn, kind, g2_col, info).items():
+                accs.setdefault(name, RunningStats()).update(arr)
+        if not accs:  # header-only file
+            accs = {"counts": RunningStats(), "file": RunningStats()}
+        return kind, delay, accs
+
+    def _info(self, csv_path):
+        """(measurement_time_s, window_ns) for the file's folder, only when accidentals are on."""
+        return info_for_csv(csv_path) if self.accidentals else (None, None)
+
+    def _file_signature(self, csv_path):
+        """
+        Everything _process_file reads for one CSV, as stored in the incremental
+        state: the CSV's [size, mtime_ns] and, when accidentals are on, the same
+        for the folder's infoMedicion.txt (None if absent). Settings shared by all
+        files live in the state header; normalize/tail_k only act on the tables.
+        """
+        st = os.stat(csv_path)
+        sig = {"csv": [int(st.st_size), int(st.st_mtime_ns)]}
+        if self.accidentals:
+            try:
+                st = os.stat(os.path.join(os.path.dirname(csv_path), "infoMedicion.txt"))
+                sig["info"] = [int(st.st_size), int(st.st_mtime_ns)]
+            except OSError:
+                sig["info"] = None
+        return sig
+
+    def _load_file(self, csv_path, kinds=("2d","3d")):
+        """
+        (normalized DataFrame, kind, delay) for one CSV, via the cache if enabled.
+        The kind is decided from the header alone; bodies of files whose kind is
+        not in `kinds` are never read (dfn is None for those).
+        """
+        if self.cache is not None:
+            hit = self.cache.load(csv_path)
+            if hit is not None and (hit[0] is not None or hit[1] not in kinds):
+                return hit
+
+        header = probe_csv_header(csv_path)
+        kind  = detect_dataset_type([normalize_col_name(c) for c in header["columns"]])
+        delay = parse_delay_from_path(csv_path)
+        if kind not in kinds or delay is None:
+            if self.cache is not None and kind not in {"2d","3d"}:
+                self.cache.store(csv_path, None, kind, delay)  # never needs a body
+            return None, kind, delay
 
-            g2_col = find_g2_column_name(dfn.columns)
-            arr_counts = self._g2_per_sample_counts(dfn, kind)
-            arr_file   = self._g2_per_sample_file(dfn, g2_col)
+        dfn = normalize_cols(read_csv_body(csv_path, header), copy=False)
+        kind = detect_dataset_type(dfn.columns)  # confirm against the parsed header
 
-            rec = bucket.setdefault(delay, {"counts":[], "file":[]})
-            if arr_counts.size: rec["counts"].append(arr_counts)
-            if arr_file.size:   rec["file"].append(arr_file)
+        if self.cache is not None:
+            # only g2 inputs are worth keeping; other kinds just remember their kind
+            self.cache.store(csv_path, dfn if kind in {"2d","3d"} else None, kind, delay)
+        return dfn, kind, delay
 
-        df_out = self._collapse_records(bucket)
-        df_out = self._add_normalized(df_out)  # no-op if self.normalize == False
-        return df_out
+    def _map_files(self, fn, paths):
+        """Ordered map of fn over paths: serial, or a process pool if workers > 1."""
+        if self.workers <= 1 or len(paths) < 2:
+            return map(fn, paths)
+        n = min(self.workers, len(paths))
+        with ProcessPoolExecutor(max_workers=n) as ex:
+            # materialize inside the with-block; chunks amortize pickling overhead
+            return list(ex.map(fn, paths, chunksize=max(1, len(paths) // (4 * n))))
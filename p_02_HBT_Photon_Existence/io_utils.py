@@ -1,5 +1,7 @@
+import csv
 import os
 import re
+from functools import lru_cache
 import pandas as pd
 
 def read_csv_flexible(path):
@@ -9,11 +11,90 @@ def read_csv_flexible(path):
     except Exception:
         return pd.read_csv(path, sep=None, engine="python", encoding="latin-1")
 
-def normalize_cols(df):
-    """Lowercase/strip/collapse whitespace in column names."""
-    import re as _re
-    out = df.copy()
-    out.columns = [_re.sub(r"\s+", " ", c).strip().lower() for c in df.columns]
+def probe_csv_header(path, nbytes=8192):
+    """
+    Sniff delimiter/encoding and column names from the first bytes of a CSV,
+    without reading the body. Returns dict(sep, encoding, skipinitialspace, columns).
+    """
+    with open(path, "rb") as fh:
+        head = fh.read(nbytes)
+    return sniff_csv_header(head, truncated=len(head) == nbytes)
+
+def sniff_csv_header(head, truncated=False):
+    """
+    probe_csv_header on bytes already in memory (e.g. the first lines of a file
+    that is still being written). truncated: head may end mid-line, so its last
+    line is not used.
+    """
+    try:
+        text, encoding = head.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError as e:
+        if e.start > len(head) - 4:  # multi-byte char cut at the probe boundary
+            text, encoding = head[:e.start].decode("utf-8"), "utf-8"
+        else:
+            text, encoding = head.decode("latin-1"), "latin-1"
+    text = text.lstrip("\ufeff")
+    lines = text.splitlines()
+    if len(lines) > 1 and truncated:
+        lines = lines[:-1]  # last line may be truncated
+    sample = "\n".join(lines[:20])
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        sep, skipinitialspace = dialect.delimiter, dialect.skipinitialspace
+    except csv.Error:
+        sep, skipinitialspace = ",", False  # e.g. single-column files
+    columns = next(csv.reader([lines[0]] if lines else [""], delimiter=sep,
+                              skipinitialspace=skipinitialspace), [])
+    return {"sep": sep, "encoding": encoding, "skipinitialspace": skipinitialspace,
+            "columns": columns}
+
+def read_csv_body(path, header):
+    """
+    Read a CSV with the fast C engine using a dialect from probe_csv_header.
+    Falls back to read_csv_flexible if the probed dialect does not parse.
+    """
+    try:
+        return pd.read_csv(path, sep=header["sep"], encoding=header["encoding"],
+                           skipinitialspace=header["skipinitialspace"], engine="c")
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError):
+        return read_csv_flexible(path)
+
+def iter_csv_chunks(path, header, chunk_rows):
+    """
+    Stream a CSV in DataFrames of at most chunk_rows rows (C engine, probed dialect),
+    so memory stays bounded regardless of file length.
+    Like read_csv_body, a file that is not valid in the probed encoding (the probe
+    only sees the first bytes) is read as latin-1, resuming after the rows
+    already yielded.
+    """
+    done = 0
+    try:
+        for chunk in _csv_chunks(path, header, header["encoding"], chunk_rows):
+            done += len(chunk)
+            yield chunk
+    except UnicodeDecodeError:
+        if header["encoding"] == "latin-1":
+            raise
+        yield from _csv_chunks(path, header, "latin-1", chunk_rows, skiprows=range(1, done + 1))
+
+def _csv_chunks(path, header, encoding, chunk_rows, skiprows=None):
+    with pd.read_csv(path, sep=header["sep"], encoding=encoding,
+                     skipinitialspace=header["skipinitialspace"], engine="c",
+                     skiprows=skiprows, chunksize=int(chunk_rows)) as reader:
+        for chunk in reader:
+            yield chunk
+
+def normalize_col_name(c):
+    """Lowercase/strip/collapse whitespace in one column name."""
+    return re.sub(r"\s+", " ", str(c)).strip().lower()
+
+def normalize_cols(df, copy=True):
+    """
+    Lowercase/strip/collapse whitespace in column names.
+    copy=False renames df in place (no data copy) and returns it.
+    """
+    out = df.copy() if copy else df
+    out.columns = [normalize_col_name(c) for c in df.columns]
     return out
 
 def detect_dataset_type(columns):
@@ -74,3 +155,49 @@ def find_g2_column_name(columns):
         if "g2(0)" in cl or "g2_0" in cl:
             return c
     return cands[-1]
+
+def read_info_file(info_path):
+    """
+    Parse infoMedicion.txt -> (measurement_time_s, window_ns).
+    Same rules as the double-slit project's dataio.read_info_file: time is the
+    first number on a line with a 'us'/'micro' token (microseconds), window the
+    first number on a line with an 'ns' token. Unlike that parser, a missing
+    value is returned as None instead of raising (e.g. Cuentas folders).
+    """
+    with open(info_path, encoding="utf-8", errors="ignore") as fh:
+        lines = fh.read().lower().splitlines()
+    measurement_time_s = window_ns = None
+    for line in lines:
+        # Remove equals, colons for simpler splitting
+        tokens = line.replace("=", " ").replace(":", " ").split()
+        if ("us" in tokens or "micro" in tokens) and measurement_time_s is None:
+            for tok in tokens:
+                try:
+                    measurement_time_s = float(tok) * 1e-6  # microseconds -> seconds
+                    break
+                except ValueError:
+                    continue
+        if "ns" in tokens and window_ns is None:
+            for tok in tokens:
+                try:
+                    window_ns = float(tok)
+                    break
+                except ValueError:
+                    continue
+    return measurement_time_s, window_ns
+
+@lru_cache(maxsize=None)
+def _info_cached(info_path, size, mtime_ns):
+    return read_info_file(info_path)
+
+def info_for_csv(csv_path):
+    """
+    (measurement_time_s, window_ns) from the infoMedicion.txt next to csv_path,
+    cached per folder (keyed by size/mtime); (None, None) if there is none.
+    """
+    info_path = os.path.join(os.path.dirname(csv_path), "infoMedicion.txt")
+    try:
+        st = os.stat(info_path)
+    except OSError:
+        return None, None
+    return _info_cached(info_path, st.st_size, st.st_mtime_ns)
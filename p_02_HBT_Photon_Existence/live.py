@@ -0,0 +1,160 @@
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from p_02_HBT_Photon_Existence.g2 import G2Analyzer
+from p_02_HBT_Photon_Existence.io_utils import (
+    sniff_csv_header, normalize_col_name, detect_dataset_type, find_g2_column_name, parse_delay_from_path
+)
+from p_02_HBT_Photon_Existence.stats import RunningStats
+
+
+class LiveG2Monitor:
+    """
+    Tail a growing HBT_2D.csv / HBT_3D.csv while the counter is still writing it.
+
+    Each poll reads only the bytes appended since the last byte offset (a partial
+    trailing line is kept for the next poll), runs the new rows through the same
+    per-sample estimators as G2Analyzer and folds them into RunningStats, so the
+    cost is O(new rows) per poll. The readout (console line, or one reused
+    matplotlib figure with plot=True) is refreshed at most every refresh_s seconds.
+    """
+
+    def __init__(self, csv_path, poll_s=0.5, refresh_s=1.0, plot=False):
+        self.csv_path = csv_path
+        self.poll_s = float(poll_s)
+        self.refresh_s = float(refresh_s)
+        self.plot = plot
+        self.delay = parse_delay_from_path(csv_path)
+        self._estimators = G2Analyzer(data_dir=None)
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self._pending = b""
+        self.columns = None   # normalized header, set once a data line follows it
+        self.header = None    # dialect from sniff_csv_header (same rule as batch ingestion)
+        self.kind = None
+        self.g2_col = None
+        self.counts = RunningStats()
+        self.file = RunningStats()
+        self.history = []     # (rows seen, g2_counts mean, g2_file mean)
+        self.n_rows = 0
+        self._last_refresh = 0.0
+        self._fig = None
+
+    # ---------- tailing ----------
+    def _read_new_bytes(self):
+        try:
+            size = os.path.getsize(self.csv_path)
+        except OSError:
+            return b""  # not created yet
+        if size < self.offset:  # file was truncated/restarted -> start over
+            self.reset()
+        if size == self.offset:
+            return b""
+        with open(self.csv_path, "rb") as fh:
+            fh.seek(self.offset)
+            data = fh.read(size - self.offset)
+        self.offset += len(data)
+        return data
+
+    def _parse_header(self, lines, nbytes=8192):
+        """Dialect and columns from the first complete lines (header + at least one row)."""
+        self.header = sniff_csv_header(lines[:nbytes], truncated=len(lines) > nbytes)
+        self.columns = [normalize_col_name(c) for c in self.header["columns"]]
+        self.kind = detect_dataset_type(self.columns)
+        self.g2_col = find_g2_column_name(self.columns)
+
+    def poll_once(self):
+        """Consume whatever was appended since the last call. Returns the number of new rows."""
+        new = self._read_new_bytes()  # may reset() on truncation, dropping the old partial line
+        data = self._pending + new
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            self._pending = data
+            return 0
+        complete, self._pending = data[:cut + 1], data[cut + 1:]
+
+        if self.columns is None:
+            if complete.count(b"\n") < 2:  # sniff with a data line, like probe_csv_header does
+                self._pending = complete + self._pending
+                return 0
+            self._parse_header(complete)
+            complete = complete[complete.find(b"\n") + 1:]
+        if not complete.strip() or self.kind not in {"2d", "3d"}:
+            return 0
+
+        dfn = pd.read_csv(io.BytesIO(complete), sep=self.header["sep"], encoding=self.header["encoding"],
+                          skipinitialspace=self.header["skipinitialspace"], header=None,
+                          names=self.columns, engine="c")
+        self.counts.update(self._estimators._g2_per_sample_counts(dfn, self.kind))
+        self.file.update(self._estimators._g2_per_sample_file(dfn, self.g2_col))
+        self.n_rows += len(dfn)
+        self.history.append((self.n_rows, self.counts.mean if self.counts.n else np.nan,
+                             self.file.mean if self.file.n else np.nan))
+        return len(dfn)
+
+    # ---------- readout ----------
+    def readout(self):
+        c_mean, _, c_sem, _ = self.counts.summary()
+        f_mean, _, f_sem, _ = self.file.summary()
+        return (f"[{self.kind or '?'} delay={self.delay}] rows={self.n_rows:d} "
+                f"g2_counts={c_mean:.4g}±{c_sem:.2g}  g2_file={f_mean:.4g}±{f_sem:.2g}")
+
+    def _refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_s:
+            return
+        self._last_refresh = now
+        if not self.plot:
+            sys.stdout.write("\r" + self.readout())
+            sys.stdout.flush()
+            return
+
+        import matplotlib.pyplot as plt
+        if self._fig is None:
+            plt.ion()
+            self._fig, self._ax = plt.subplots()
+            (self._line,) = self._ax.plot([], [], "o-", ms=3)
+            self._ax.set_xlabel("rows")
+            self._ax.set_ylabel(r"$g^{(2)}$ (CSV column, running mean)")
+        if self.history:
+            h = np.asarray(self.history)
+            self._line.set_data(h[:, 0], h[:, 2])
+            self._ax.relim()
+            self._ax.autoscale_view()
+        self._ax.set_title(self.readout(), fontsize=8)
+        self._fig.canvas.draw_idle()
+        plt.pause(0.001)
+
+    def run(self, duration_s=None):
+        """Poll until duration_s elapses (None = until Ctrl+C)."""
+        t_end = None if duration_s is None else time.monotonic() + duration_s
+        try:
+            while t_end is None or time.monotonic() < t_end:
+                if self.poll_once():
+                    self._refresh()
+                time.sleep(self.poll_s)
+        except KeyboardInterrupt:
+            pass
+        self._refresh(force=True)
+        if not self.plot:
+            sys.stdout.write("\n")
+        return self.counts.summary(), self.file.summary()
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Live g2 readout for a growing HBT CSV.")
+    ap.add_argument("csv_path")
+    ap.add_argument("--poll", type=float, default=0.5, help="seconds between file polls")
+    ap.add_argument("--refresh", type=float, default=1.0, help="min seconds between readout refreshes")
+    ap.add_argument("--plot", action="store_true", help="live matplotlib figure instead of console line")
+    ap.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    args = ap.parse_args()
+    LiveG2Monitor(args.csv_path, poll_s=args.poll, refresh_s=args.refresh, plot=args.plot).run(args.duration)
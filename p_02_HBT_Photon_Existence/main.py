@@ -4,90 +4,152 @@ if __package__ is None or __package__ == "":
     # insert the parent directory (that contains 'photon_existence') into sys.path
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from p_02_HBT_Photon_Existence.config import DATA_DIR, OUT_DIR, NORMALIZE_DEFAULT, COMPARE_OVERLAY
+from p_02_HBT_Photon_Existence.config import (
+    DATA_DIR, OUT_DIR, NORMALIZE_DEFAULT, COMPARE_OVERLAY, N_WORKERS,
+    USE_CACHE, CACHE_DIR, CACHE_VERIFY_HASH, CHUNK_ROWS,
+    BOOTSTRAP_N, BOOTSTRAP_CI, BOOTSTRAP_SEED, USE_MANIFEST, MANIFEST_PATH,
+    INCREMENTAL, STATE_PATH, ACCIDENTALS_CORRECTION, NORMALIZE_TAIL_K,
+    STABILITY_CHECK, STABILITY_DRIFT_TOL, STABILITY_ADEV_TOL, FIT_WINDOW, FIT_WINDOW_SERIES,
+    PLOT_WORKERS, PLOT_SKIP_UNCHANGED, PLOT_STATE_PATH
+)
 from p_02_HBT_Photon_Existence.g2 import G2Analyzer
-from p_02_HBT_Photon_Existence.plotting import plot_scatter, plot_overlay
+from p_02_HBT_Photon_Existence.manifest import DatasetManifest
+from p_02_HBT_Photon_Existence.profiling import Profiler
 from p_02_HBT_Photon_Existence.report import save_table, headline_min_delay
+# stability, bootstrap, window_fit and plotting (matplotlib) are imported where they are
+# used, so table-only runs start without them
 
-def main():
+def main(profile_path=None, plots=True, tables_only=False):
+    """
+    Full pipeline. plots=False skips figures; tables_only=True only computes and
+    saves the g2 tables (no stability check, bootstrap, window fit or figures).
+    """
+    prof = Profiler(enabled=profile_path is not None)
     print("Data root:", DATA_DIR)
-    analyzer = G2Analyzer(data_dir=DATA_DIR, normalize=NORMALIZE_DEFAULT, tail_k=3)
+    with prof.stage("manifest"):
+        if USE_MANIFEST:
+            added, changed, removed = DatasetManifest(DATA_DIR, MANIFEST_PATH).update()
+            print(f"Manifest: +{len(added)} new, {len(changed)} changed, -{len(removed)} removed")
+    with prof.stage("stability"):
+        if STABILITY_CHECK and not tables_only:
+            # flag unstable singles rates before aggregating g2
+            from p_02_HBT_Photon_Existence.stability import CountsStability
+            stab = CountsStability(chunk_rows=CHUNK_ROWS or 1_000_000, drift_tol=STABILITY_DRIFT_TOL,
+                                   adev_tol=STABILITY_ADEV_TOL).analyze_tree(DATA_DIR)
+            if not stab.empty:
+                save_table(stab, "counts_stability.csv", OUT_DIR)
+                for _, r in stab[stab["unstable"]].iterrows():
+                    print(f"WARNING unstable singles: {r['file']} {r['channel']} "
+                          f"(drift {r['drift_rel']:+.1%}, adev/poisson {r['adev_ratio_max']:.2f})")
+    analyzer = G2Analyzer(data_dir=DATA_DIR, normalize=NORMALIZE_DEFAULT, tail_k=NORMALIZE_TAIL_K, workers=N_WORKERS,
+                          cache_dir=CACHE_DIR if USE_CACHE else None, cache_verify_hash=CACHE_VERIFY_HASH,
+                          chunk_rows=CHUNK_ROWS, manifest_path=MANIFEST_PATH if USE_MANIFEST else None,
+                          accidentals=ACCIDENTALS_CORRECTION)
 
-    # Compute both experiments
-    df2 = analyzer.compute(kind="2d")  # unheralded
-    df3 = analyzer.compute(kind="3d")  # heralded
-
-    # Save tables
-    if df2 is not None and not df2.empty:
-        save_table(df2, "g2_2detectors_by_delay.csv", OUT_DIR)
-    if df3 is not None and not df3.empty:
-        save_table(df3, "g2_3detectors_by_delay.csv", OUT_DIR)
-
-    # ---- Plotting logic ----
-    # RAW scale
-    if df2 is not None and not df2.empty:
-        if COMPARE_OVERLAY:
-            plot_overlay(df2, normalized=False,
-                         title="2 detectores (RAW, counts vs CSV)",
-                         filename="plot_g2_2detectors_overlay_raw.png")
+    # Compute both experiments (single pass over the sample tree)
+    with prof.stage("compute"):
+        if INCREMENTAL:
+            # only new/changed folders are re-read; the tables are rebuilt from the saved accumulators
+            tables, changed = analyzer.compute_incremental(STATE_PATH, kinds=("2d", "3d"))
+            print("Changed delays:", changed)
         else:
-            # plot_scatter(df2, which="counts", normalized=False,
-            #              title="2 detectores from counts (RAW)",
-            #              filename="plot_g2_2detectors_counts_raw.png")  # que es la función de correlación calculada a partir de los "conteos" y las "coincidencias"
-            plot_scatter(df2, which="file", normalized=False,  # que son los scatters normalizados
-                         title="2 detectores",
-                         filename="plot_g2_2detectors_file_raw.png")
+            tables = analyzer.compute_all(kinds=("2d", "3d"))
+    df2 = tables["2d"]  # unheralded
+    df3 = tables["3d"]  # heralded
 
-    if df3 is not None and not df3.empty:
-        if COMPARE_OVERLAY:
-            plot_overlay(df3, normalized=False,
-                         title="3 detectores (RAW, counts vs CSV)",
-                         filename="plot_g2_3detectors_overlay_raw.png")
-        else:
-            # plot_scatter(df3, which="counts", normalized=False,
-            #              title="3 detectores from counts (RAW)",
-            #              filename="plot_g2_3detectors_counts_raw.png")  # que es la función de correlación calculada a partir de los "conteos" y las "coincidencias"
-            plot_scatter(df3, which="file", normalized=False,  # que son los scatters normalizados
-                         title="3 detectores",
-                         filename="plot_g2_3detectors_file_raw.png")
+    # Optional bootstrap CIs (include the uncertainty of the normalization tail)
+    with prof.stage("bootstrap"):
+        if BOOTSTRAP_N and not tables_only:
+            from p_02_HBT_Photon_Existence.bootstrap import G2Bootstrap
+            boot = G2Bootstrap(analyzer, n_boot=BOOTSTRAP_N, ci=BOOTSTRAP_CI, seed=BOOTSTRAP_SEED, workers=N_WORKERS)
+            cis = boot.compute_all(kinds=("2d", "3d"))
+            if not df2.empty:
+                df2 = df2.merge(cis["2d"], on="delay_ns", how="left")
+            if not df3.empty:
+                df3 = df3.merge(cis["3d"], on="delay_ns", how="left")
 
-    # NORMALIZED scale (only meaningful if analyzer.normalize == True and *_norm columns exist)
-    if df2 is not None and not df2.empty:
-        if COMPARE_OVERLAY:
-            plot_overlay(df2, normalized=True,
-                         title="2 detectores (NORMALIZED, counts vs CSV)",
-                         filename="plot_g2_2detectors_overlay_norm.png")
-        else:
-            # plot_scatter(df2, which="counts", normalized=True,
-            #              title="2 detectores from counts (NORMALIZED)",
-            #              filename="plot_g2_2detectors_counts_norm.png")
-            plot_scatter(df2, which="file", normalized=True,  # que son los scatters normalizados
-                         title="2 detectores (valores normalizados)",  # de la columna ya existente en el archivo ".csv"
-                         filename="plot_g2_2detectors_file_norm.png")
+    # g2 vs window fit (both experiments in one batched call) -> g2(tau->0)
+    with prof.stage("fit"):
+        if FIT_WINDOW and NORMALIZE_DEFAULT and not tables_only:
+            from p_02_HBT_Photon_Existence.window_fit import G2WindowFitter
+            fits = G2WindowFitter(series=FIT_WINDOW_SERIES, normalized=True).fit({"2d": df2, "3d": df3})
+            save_table(fits, "g2_window_fit.csv", OUT_DIR)
+            for _, r in fits.iterrows():
+                if r["n_points"] < 4:
+                    print(f"{r['name'].upper()} window fit: too few windows to fit "
+                          f"({r['n_points']} usable, need 4), no g2(0) estimate")
+                    continue
+                if not r["identifiable"]:
+                    print(f"{r['name'].upper()} window fit: not identifiable (tau_c at/below the smallest "
+                          f"windows or degenerate parameters), no g2(0) estimate")
+                    continue
+                if not r["converged"]:
+                    print(f"{r['name'].upper()} window fit: did not converge, no g2(0) estimate")
+                    continue
+                print(f"{r['name'].upper()} window fit: g2(0) = {r['g2_0']:.4f} +/- {r['g2_0_err']:.4f} "
+                      f"(tau_c = {r['tau_c_ns']:.3g} ns, chi2_red = {r['chi2_red']:.2f})")
 
-    if df3 is not None and not df3.empty:
-        if COMPARE_OVERLAY:
-            plot_overlay(df3, normalized=True,
-                         title="3 detectores (NORMALIZED, counts vs CSV)",
-                         filename="plot_g2_3detectors_overlay_norm.png")
-        else:
-            # plot_scatter(df3, which="counts", normalized=True,
-            #              title="3 detectores from counts (NORMALIZED)",
-            #              filename="plot_g2_3detectors_counts_norm.png")
-            plot_scatter(df3, which="file", normalized=True,  # que son los scatters normalizados
-                         title="3 detectores (valores normalizados)",  # de la columna ya existente en el archivo ".csv"
-                         filename="plot_g2_3detectors_file_norm.png")
+    # Save tables (cheap, so always rewritten: they also depend on normalize/tail_k/accidentals)
+    with prof.stage("save"):
+        if df2 is not None and not df2.empty:
+            save_table(df2, "g2_2detectors_by_delay.csv", OUT_DIR)
+        if df3 is not None and not df3.empty:
+            save_table(df3, "g2_3detectors_by_delay.csv", OUT_DIR)
+
+    # ---- Plotting logic ----
+    # One batch of independent figures, rendered headless (Agg); a PNG whose input columns
+    # and style settings are unchanged since its last render is skipped.
+    with prof.stage("plot"):
+        jobs = []
+        # every figure is always submitted: render_batch skips it by hash (data + style settings)
+        for df, n in ((df2, 2), (df3, 3)):
+            if not plots or tables_only or df is None or df.empty:
+                continue
+            for normalized, tag in ((False, "raw"), (True, "norm")):
+                if COMPARE_OVERLAY:
+                    jobs.append(dict(kind="overlay", df=df, normalized=normalized,
+                                     title=f"{n} detectores ({'NORMALIZED' if normalized else 'RAW'}, counts vs CSV)",
+                                     filename=f"plot_g2_{n}detectors_overlay_{tag}.png"))
+                else:
+                    # which="counts" would plot g2 computed from the counts and coincidences;
+                    # "file" plots the g2 column already present in the ".csv"
+                    jobs.append(dict(kind="scatter", df=df, which="file", normalized=normalized,
+                                     title=f"{n} detectores" + (" (valores normalizados)" if normalized else ""),
+                                     filename=f"plot_g2_{n}detectors_file_{tag}.png"))
+        rendered = {}
+        if jobs:
+            from p_02_HBT_Photon_Existence.plotting import render_batch
+            rendered = render_batch(jobs, workers=PLOT_WORKERS,
+                                    state_path=PLOT_STATE_PATH if PLOT_SKIP_UNCHANGED else None)
+        if rendered:
+            print(f"Plots: {sum(rendered.values())} rendered, {len(rendered) - sum(rendered.values())} unchanged")
 
     # Headlines (optional)
     if df2 is not None and not df2.empty:
         print("2D counts @ min window (raw): ", headline_min_delay(df2, which="counts", normalized=False))
         print("2D counts @ min window (norm):", headline_min_delay(df2, which="counts", normalized=True))
+        if "g2_counts_corr_mean" in df2.columns:
+            print("2D counts, accidentals subtracted (raw): ", headline_min_delay(df2, which="counts_corr", normalized=False))
+            print("2D counts, accidentals subtracted (norm):", headline_min_delay(df2, which="counts_corr", normalized=True))
     if df3 is not None and not df3.empty:
         print("3D counts @ min window (raw): ", headline_min_delay(df3, which="counts", normalized=False))
         print("3D counts @ min window (norm):", headline_min_delay(df3, which="counts", normalized=True))
 
-if __name__ == "__main__":
-    main()
+    if prof.enabled:
+        prof.print_summary()
+        print("Profile:", prof.write(profile_path))
+
+def cli(argv=None):
+    """python -m p_02_HBT_Photon_Existence [--no-plots | --tables-only] [--profile [JSON]]"""
+    import argparse
+    ap = argparse.ArgumentParser(prog="p_02_HBT_Photon_Existence", description="HBT g2 pipeline.")
+    ap.add_argument("--no-plots", action="store_true", help="skip figures (matplotlib is never imported)")
+    ap.add_argument("--tables-only", action="store_true",
+                    help="only compute and save the g2 tables (no stability check, bootstrap, fit or figures)")
+    ap.add_argument("--profile", nargs="?", const=os.path.join(OUT_DIR, "profile.json"), default=None,
+                    metavar="JSON", help="time/memory per stage -> JSON (+ .folded stacks)")
+    args = ap.parse_args(argv)
+    main(args.profile, plots=not args.no_plots, tables_only=args.tables_only)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    cli()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import json
+import os
+
+from p_02_HBT_Photon_Existence.io_utils import (
+    find_all_csvs, probe_csv_header, normalize_col_name, detect_dataset_type, parse_delay_from_path
+)
+
+
+def count_data_rows(path, block=1 << 20):
+    """Number of data rows (lines after the header) by counting newlines in raw blocks."""
+    n = 0
+    last = b"\n"
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(block), b""):
+            n += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        n += 1  # final line without trailing newline
+    return max(0, n - 1)
+
+
+class DatasetManifest:
+    """
+    One-file index of the CSVs under a sample tree.
+
+    Per file (path relative to root): kind ('2d'/'3d'/'cuentas'/'other'), delay,
+    row count, normalized column list, size and mtime_ns. update() only
+    re-probes files whose size/mtime changed (plus new ones) and drops removed
+    ones; select() then answers "which files of these kinds?" from the index
+    alone, without walking the tree or opening any CSV.
+    """
+
+    VERSION = 1
+
+    def __init__(self, root_dir, index_path):
+        self.root_dir = os.path.abspath(root_dir)
+        self.index_path = index_path
+        self.entries = {}  # relative path -> dict
+        if os.path.exists(index_path):
+            self.load()
+
+    # ---------- persistence ----------
+    def load(self):
+        with open(self.index_path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") != self.VERSION or data.get("root") != self.root_dir:
+            self.entries = {}  # stale format or a different tree: rebuild on update()
+            return
+        self.entries = {e["path"]: e for e in data["files"]}
+
+    def save(self):
+        data = {"version": self.VERSION, "root": self.root_dir,
+                "files": [self.entries[p] for p in sorted(self.entries)]}
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    # ---------- building ----------
+    def _describe(self, abs_path, rel, st):
+        cols = [normalize_col_name(c) for c in probe_csv_header(abs_path)["columns"]]
+        return {
+            "path": rel,
+            "kind": detect_dataset_type(cols),
+            "delay": parse_delay_from_path(abs_path),
+            "rows": count_data_rows(abs_path),
+            "columns": cols,
+            "size": int(st.st_size),
+            "mtime_ns": int(st.st_mtime_ns),
+        }
+
+    def update(self, save=True):
+        """
+        Incrementally sync the index with the tree. Returns (added, changed, removed)
+        as lists of relative paths.
+        """
+        added, changed = [], []
+        seen = set()
+        for abs_path in find_all_csvs(self.root_dir):
+            rel = os.path.relpath(abs_path, self.root_dir)
+            seen.add(rel)
+            st = os.stat(abs_path)
+            old = self.entries.get(rel)
+            if old is not None and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                continue
+            self.entries[rel] = self._describe(abs_path, rel, st)
+            (added if old is None else changed).append(rel)
+        removed = sorted(set(self.entries) - seen)
+        for rel in removed:
+            del self.entries[rel]
+        if save:
+            self.save()
+        return added, changed, removed
+
+    # ---------- queries ----------
+    def select(self, kinds=("2d","3d")):
+        """Absolute paths (sorted, like find_all_csvs) of files of the given kinds with a delay."""
+        kinds = set(kinds)
+        return sorted(os.path.join(self.root_dir, rel) for rel, e in self.entries.items()
+                      if e["kind"] in kinds and e["delay"] is not None)
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame([self.entries[p] for p in sorted(self.entries)])
+
+    def __len__(self):
+        return len(self.entries)
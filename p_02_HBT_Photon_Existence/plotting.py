@@ -1,6 +1,13 @@
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from p_02_HBT_Photon_Existence.config import OUT_DIR, FIG_DPI, ERRORBAR_KIND, XAXIS_LABEL, ERRORBAR_COLOR, ERRORBAR_COLOR_COUNTS, ERRORBAR_COLOR_FILE, XAXIS_LABEL, YLABEL_G2, YLABEL_G2_N
 
 def _series_cols(which, normalized):
@@ -12,6 +19,49 @@ def _series_cols(which, normalized):
         e = f"{series}_norm_sem" if normalized else f"{series}_sem"
     return y, e
 
+# ---------- drawing (shared by the pyplot functions and the batch renderer) ----------
+def _scatter_data(df, ycol, ecol):
+    return {"x": df["delay_ns"].values, "y": df[ycol].values, "e": df[ecol].values}
+
+def _overlay_data(df, normalized):
+    """x plus (y, e) of each series that exists: {"x":..., "counts": (y, e), "file": (y, e)}."""
+    data = {"x": df["delay_ns"].values}
+    for which in ("counts", "file"):
+        y, e = _series_cols(which, normalized)
+        if y in df.columns and e in df.columns and df[y].notna().any():
+            data[which] = (df[y].values, df[e].values)
+    return data
+
+def _draw_scatter(ax, data, normalized, title):
+    ax.errorbar(data["x"], data["y"], yerr=data["e"], fmt='o-', capsize=3, ecolor=ERRORBAR_COLOR, elinewidth=1.2)  # marker circle; autoscaled
+    ax.margins(y=0.12)  # add headroom so error bars aren’t clipped
+    ax.set_xlabel(XAXIS_LABEL)
+    ax.set_ylabel(YLABEL_G2 if not normalized else YLABEL_G2_N)
+    ax.set_title(title)
+
+def _draw_overlay(ax, data, normalized, title):
+    # Plot counts series if present
+    if "counts" in data:
+        y, e = data["counts"]
+        ax.errorbar(
+            data["x"], y, yerr=e,
+            fmt='o-', capsize=3, ecolor=ERRORBAR_COLOR_COUNTS, elinewidth=1.2, label="from counts"
+        )
+
+    # Plot file series if present
+    if "file" in data:
+        y, e = data["file"]
+        ax.errorbar(
+            data["x"], y, yerr=e,
+            fmt='s--', capsize=3, ecolor=ERRORBAR_COLOR_FILE, elinewidth=1.2, label="from CSV g2 column"
+        )
+
+    ax.margins(y=0.12)  # ensure error bars have headroom
+    ax.set_xlabel("Delay / coincidence window (ns)")
+    ax.set_ylabel("g2 (normalized)" if normalized else "g2 (mean)")
+    ax.set_title(title)
+    ax.legend()
+
 def plot_scatter(df, which="counts", normalized=False, title="", filename=""):
     """
     Single series (either 'counts' or 'file') with error bars.
@@ -24,16 +74,8 @@ def plot_scatter(df, which="counts", normalized=False, title="", filename=""):
     if ycol not in df.columns or ecol not in df.columns:
         return None
 
-    xvals = df["delay_ns"].values
-    yvals = df[ycol].values
-    yerr  = df[ecol].values
-
     plt.figure()
-    plt.errorbar(xvals, yvals, yerr=yerr, fmt='o-', capsize=3, ecolor=ERRORBAR_COLOR, elinewidth=1.2)  # marker circle; autoscaled
-    plt.margins(y=0.12)  # add headroom so error bars aren’t clipped
-    plt.xlabel(XAXIS_LABEL)
-    plt.ylabel(YLABEL_G2 if not normalized else YLABEL_G2_N)
-    plt.title(title)
+    _draw_scatter(plt.gca(), _scatter_data(df, ycol, ecol), normalized, title)
     out = os.path.join(OUT_DIR, filename)
     plt.savefig(out, dpi=FIG_DPI, bbox_inches="tight")
     plt.close()
@@ -58,30 +100,100 @@ def plot_overlay(df, normalized=False, title="", filename=""):
     if not have_counts and not have_file:
         return None
 
-    xvals = df["delay_ns"].values
-
     plt.figure()
-
-    # Plot counts series if present
-    if have_counts:
-        plt.errorbar(
-            xvals, df[y_counts].values, yerr=df[e_counts].values,
-            fmt='o-', capsize=3, ecolor=ERRORBAR_COLOR_COUNTS, elinewidth=1.2, label="from counts"
-        )
-
-    # Plot file series if present
-    if have_file:
-        plt.errorbar(
-            xvals, df[y_file].values, yerr=df[e_file].values,
-            fmt='s--', capsize=3, ecolor=ERRORBAR_COLOR_FILE, elinewidth=1.2, label="from CSV g2 column"
-        )
-
-    plt.margins(y=0.12)  # ensure error bars have headroom
-    plt.xlabel("Delay / coincidence window (ns)")
-    plt.ylabel("g2 (normalized)" if normalized else "g2 (mean)")
-    plt.title(title)
-    plt.legend()
+    _draw_overlay(plt.gca(), _overlay_data(df, normalized), normalized, title)
     out = os.path.join(OUT_DIR, filename)
     plt.savefig(out, dpi=FIG_DPI, bbox_inches="tight")
     plt.close()
-    return out
\ No newline at end of file
+    return out
+
+# ---------- headless batch rendering ----------
+def _style_settings():
+    """Everything from config.py (plus the matplotlib version) that changes how a PNG looks."""
+    return [FIG_DPI, ERRORBAR_KIND, XAXIS_LABEL, YLABEL_G2, YLABEL_G2_N,
+            list(ERRORBAR_COLOR), list(ERRORBAR_COLOR_COUNTS), list(ERRORBAR_COLOR_FILE), matplotlib.__version__]
+
+def _job_payload(job):
+    """
+    job: dict(kind="scatter"|"overlay", df, which, normalized, title, filename).
+    Returns (filename, (kind, data, normalized, title)) with only the arrays the
+    figure needs, or None if there is nothing to draw (same rules as plot_scatter/plot_overlay).
+    """
+    df, normalized = job["df"], job.get("normalized", False)
+    if df is None or df.empty:
+        return None
+    if job["kind"] == "scatter":
+        ycol, ecol = _series_cols(job.get("which", "counts"), normalized)
+        if ycol not in df.columns or ecol not in df.columns:
+            return None
+        data = _scatter_data(df, ycol, ecol)
+    else:
+        data = _overlay_data(df, normalized)
+        if len(data) == 1:
+            return None
+    return job["filename"], (job["kind"], data, normalized, job.get("title", ""))
+
+def _payload_hash(payload):
+    kind, data, normalized, title = payload
+    h = hashlib.sha1(json.dumps([kind, bool(normalized), title, _style_settings()]).encode("utf-8"))
+    for key in sorted(data):
+        arrays = data[key] if isinstance(data[key], tuple) else (data[key],)
+        for arr in arrays:
+            h.update(key.encode("utf-8"))
+            h.update(np.ascontiguousarray(arr, dtype=float).tobytes())
+    return h.hexdigest()
+
+def _render_many(items):
+    """Render [(out_path, payload)] on one reused Agg figure/axes (no pyplot state)."""
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    for out, (kind, data, normalized, title) in items:
+        ax.cla()
+        (_draw_scatter if kind == "scatter" else _draw_overlay)(ax, data, normalized, title)
+        fig.savefig(out, dpi=FIG_DPI, bbox_inches="tight")
+    return [out for out, _ in items]
+
+def render_batch(jobs, workers=1, state_path=None):
+    """
+    Render many figures headless (Agg). Each job is a dict like the arguments of
+    plot_scatter/plot_overlay plus kind="scatter"|"overlay".
+
+    With state_path, a PNG is skipped when the sha1 of its input columns, title
+    and config style settings matches its previous render (and the file exists).
+    Remaining figures are split over `workers` processes, each reusing one figure.
+    Returns {path: True if rendered, False if skipped}.
+    """
+    state = {}
+    if state_path and os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as fh:
+            state = json.load(fh)
+
+    todo, result = [], {}
+    for job in jobs:
+        item = _job_payload(job)
+        if item is None:
+            continue
+        filename, payload = item
+        out = os.path.join(OUT_DIR, filename)
+        digest = _payload_hash(payload)
+        if state.get(filename) == digest and os.path.exists(out):
+            result[out] = False
+            continue
+        state[filename] = digest
+        todo.append((out, payload))
+        result[out] = True
+
+    workers = min(int(workers or 1), len(todo))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(_render_many, [todo[i::workers] for i in range(workers)]))
+    elif todo:
+        _render_many(todo)
+
+    if state_path:
+        tmp = state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, indent=1)
+        os.replace(tmp, state_path)
+    return result
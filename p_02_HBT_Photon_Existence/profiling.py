@@ -0,0 +1,102 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+_NULL = nullcontext()
+
+
+class Profiler:
+    """
+    Stage timers and tracemalloc peaks, off by default.
+
+        prof = Profiler(enabled=True)
+        with prof.stage("load"):
+            ...
+        @prof.timed("fit")
+        def fit(...): ...
+        prof.write("profile.json")   # + profile.folded (flamegraph collapsed stacks)
+
+    Stages nest; each is keyed by its stack path ("compute;load"). Repeated
+    stages accumulate calls and time, and keep the largest memory peak. When
+    disabled, stage() returns a shared no-op context manager and timed()
+    returns the function unchanged, so instrumentation costs nothing.
+    """
+
+    def __init__(self, enabled=False, memory=True):
+        self.enabled = enabled
+        self.memory = memory and enabled
+        self.records = {}  # path -> {"calls", "seconds", "child_seconds", "peak_bytes"}
+        self._stack = []   # [name, t0, child_seconds, running peak]
+        self._owns_tracing = False
+
+    def stage(self, name):
+        return self._stage(name) if self.enabled else _NULL
+
+    def timed(self, name=None):
+        def deco(fn):
+            if not self.enabled:
+                return fn
+            label = name or fn.__qualname__
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self._stage(label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    @contextmanager
+    def _stage(self, name):
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            if self._stack:  # remember the parent's peak so far before resetting it
+                self._stack[-1][3] = max(self._stack[-1][3], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = [name, time.perf_counter(), 0.0, 0]
+        self._stack.append(frame)
+        path = ";".join(f[0] for f in self._stack)
+        # registered on entry so the report lists stages in the order they start
+        rec = self.records.setdefault(path, {"calls": 0, "seconds": 0.0, "child_seconds": 0.0, "peak_bytes": 0})
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            peak = max(frame[3], tracemalloc.get_traced_memory()[1]) if self.memory else 0
+            self._stack.pop()
+            rec["calls"] += 1
+            rec["seconds"] += elapsed
+            rec["child_seconds"] += frame[2]
+            rec["peak_bytes"] = max(rec["peak_bytes"], peak)
+            if self._stack:
+                self._stack[-1][2] += elapsed
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            elif self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    # ---------- report ----------
+    def report(self):
+        return [{"stage": path, "depth": path.count(";"), "calls": r["calls"], "seconds": r["seconds"],
+                 "self_seconds": r["seconds"] - r["child_seconds"], "peak_bytes": r["peak_bytes"]}
+                for path, r in self.records.items()]
+
+    def folded(self):
+        """Collapsed-stack lines 'a;b;c <self microseconds>' (flamegraph.pl, speedscope)."""
+        return [f"{r['stage']} {max(0, round(r['self_seconds'] * 1e6))}" for r in self.report()]
+
+    def write(self, path):
+        """JSON report at path and collapsed stacks next to it (.folded)."""
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "stages": self.report()}, fh, indent=2)
+        with open(os.path.splitext(path)[0] + ".folded", "w", encoding="utf-8") as fh:
+            fh.write("\n".join(self.folded()) + "\n")
+        return path
+
+    def print_summary(self):
+        for r in self.report():
+            print(f"{'  ' * r['depth']}{r['stage'].rsplit(';', 1)[-1]:<24s} {r['seconds']*1e3:10.2f} ms  "
+                  f"x{r['calls']:<4d} peak {r['peak_bytes'] / 2**20:8.2f} MiB")
@@ -11,7 +11,7 @@ def headline_min_delay(df, which="counts", normalized=False):
     """
     if df is None or df.empty:
         return {}
-    series = "g2_counts" if which == "counts" else "g2_file"
+    series = f"g2_{which}" if which in ("counts", "counts_corr") else "g2_file"
     y  = f"{series}_norm" if normalized else f"{series}_mean"
     es = f"{series}_norm_std" if normalized else f"{series}_std"
     row = df.iloc[df["delay_ns"].argmin()]
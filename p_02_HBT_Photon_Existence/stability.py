@@ -0,0 +1,216 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from p_02_HBT_Photon_Existence.io_utils import (
+    find_all_csvs, probe_csv_header, iter_csv_chunks, normalize_cols, normalize_col_name,
+    detect_dataset_type, info_for_csv
+)
+from p_02_HBT_Photon_Existence.stats import RunningStats
+
+_CHANNEL_ALIASES = {
+    "ch1": ("ch 1", "ch1", "channel 1"),
+    "ch2": ("ch 2", "ch2", "channel 2"),
+    "ch3": ("ch 3", "ch3", "channel 3"),
+}
+
+
+class LinearTrend:
+    """
+    Mergeable streaming least-squares line y = a + b*t (count, means, co-moments).
+    Same batch update as RunningStats, so the slope needs O(1) memory.
+    """
+
+    __slots__ = ("n", "mean_t", "mean_y", "ctt", "cty")
+
+    def __init__(self):
+        self.n = 0
+        self.mean_t = self.mean_y = 0.0
+        self.ctt = self.cty = 0.0
+
+    def update(self, t, y):
+        t = np.asarray(t, dtype=float)
+        y = np.asarray(y, dtype=float)
+        ok = ~np.isnan(y)
+        t, y = t[ok], y[ok]
+        if t.size == 0:
+            return self
+        mt, my = float(t.mean()), float(y.mean())
+        dt = t - mt
+        n_a, n_b = self.n, t.size
+        n = n_a + n_b
+        d_t, d_y = mt - self.mean_t, my - self.mean_y
+        self.ctt += float(dt @ dt) + d_t * d_t * n_a * n_b / n
+        self.cty += float(dt @ (y - my)) + d_t * d_y * n_a * n_b / n
+        self.mean_t += d_t * n_b / n
+        self.mean_y += d_y * n_b / n
+        self.n = n
+        return self
+
+    def slope(self):
+        return self.cty / self.ctt if self.n > 1 and self.ctt > 0 else np.nan
+
+
+class OctaveAllan:
+    """
+    Streaming non-overlapping Allan variance at averaging factors m = 1, 2, 4, ...
+
+    Level k holds block means of 2^k samples: each level keeps only its last
+    block mean (for the successive difference) and at most one unpaired block
+    (carried into the next chunk), and feeds pairwise means to level k+1. Memory
+    is O(levels) regardless of acquisition length; chunks are processed vectorized.
+    """
+
+    def __init__(self, max_levels=40):
+        self.max_levels = max_levels
+        self.prev  = []  # last block mean per level
+        self.carry = []  # unpaired block mean per level (or None)
+        self.sum_d2 = []
+        self.n_d    = []
+
+    def update(self, x):
+        vals = np.asarray(x, dtype=float)
+        for k in range(self.max_levels):
+            if vals.size == 0:
+                break
+            if k == len(self.prev):
+                self.prev.append(None)
+                self.carry.append(None)
+                self.sum_d2.append(0.0)
+                self.n_d.append(0)
+            seq = vals if self.prev[k] is None else np.concatenate(([self.prev[k]], vals))
+            d = np.diff(seq)
+            self.sum_d2[k] += float(d @ d)
+            self.n_d[k] += d.size
+            self.prev[k] = float(vals[-1])
+
+            if self.carry[k] is not None:
+                vals = np.concatenate(([self.carry[k]], vals))
+            even = vals.size - (vals.size % 2)
+            self.carry[k] = float(vals[-1]) if vals.size % 2 else None
+            vals = 0.5 * (vals[0:even:2] + vals[1:even:2])
+        return self
+
+    def table(self):
+        """[(m, allan variance, number of differences)] for levels with at least one difference."""
+        return [(2 ** k, 0.5 * s / n, n) for k, (s, n) in enumerate(zip(self.sum_d2, self.n_d)) if n > 0]
+
+
+class CountsStability:
+    """
+    Singles-rate stability of 'cuentas' files (CH 1/CH 2/CH 3 counts per interval).
+
+    One streaming pass per file (chunks of chunk_rows) gives, per channel:
+      - rate mean/std (counts/s) and Fano factor (1 for Poisson counts),
+      - linear drift of the rate (counts/s per hour and relative over the run),
+      - octave-spaced Allan deviation of the rate vs the Poisson expectation sqrt(rate/tau).
+    A channel is flagged unstable if |relative drift| > drift_tol or the Allan
+    deviation exceeds adev_tol x Poisson at any tau with at least min_pairs differences.
+    The interval T comes from infoMedicion.txt next to the CSV unless interval_s is given.
+    """
+
+    def __init__(self, interval_s=None, chunk_rows=1_000_000, drift_tol=0.05, adev_tol=3.0, min_pairs=8):
+        self.interval_s = interval_s
+        self.chunk_rows = chunk_rows
+        self.drift_tol = drift_tol
+        self.adev_tol = adev_tol
+        self.min_pairs = min_pairs
+
+    def _interval(self, csv_path):
+        if self.interval_s:
+            return float(self.interval_s)
+        T, _ = info_for_csv(csv_path)
+        if not T:
+            raise ValueError(f"No acquisition interval for {csv_path}: pass interval_s or add infoMedicion.txt")
+        return T
+
+    # ---------- one file ----------
+    def analyze_file(self, csv_path):
+        """
+        Returns (summary, allan): summary has one row per channel, allan one row
+        per (channel, tau_s) with adev, adev_poisson and n_pairs.
+        """
+        header = probe_csv_header(csv_path)
+        cols = [normalize_col_name(c) for c in header["columns"]]
+        channels = {}
+        for name, aliases in _CHANNEL_ALIASES.items():
+            hit = next((c for c in aliases if c in cols), None)
+            if hit is not None:
+                channels[name] = hit
+        T = self._interval(csv_path)
+
+        counts = {ch: RunningStats() for ch in channels}
+        trend  = {ch: LinearTrend() for ch in channels}
+        allan  = {ch: OctaveAllan() for ch in channels}
+        offset = 0
+        for chunk in iter_csv_chunks(csv_path, header, self.chunk_rows):
+            dfn = normalize_cols(chunk, copy=False)
+            t = (offset + np.arange(len(dfn))) * T
+            offset += len(dfn)
+            for ch, col in channels.items():
+                rate = pd.to_numeric(dfn[col], errors="coerce").to_numpy(dtype=float) / T
+                counts[ch].update(rate * T)
+                trend[ch].update(t, rate)
+                allan[ch].update(rate)
+
+        rows, adev_rows = [], []
+        duration_s = offset * T
+        for ch in channels:
+            c_mean, c_std, _, n = counts[ch].summary()
+            rate_mean = c_mean / T
+            slope = trend[ch].slope()  # counts/s per s
+            drift_rel = slope * duration_s / rate_mean if rate_mean else np.nan
+            worst = np.nan
+            for m, avar, n_pairs in allan[ch].table():
+                tau = m * T
+                adev = float(np.sqrt(avar))
+                adev_p = float(np.sqrt(rate_mean / tau)) if rate_mean > 0 else np.nan
+                adev_rows.append({"channel": ch, "tau_s": tau, "adev": adev,
+                                  "adev_poisson": adev_p, "n_pairs": n_pairs})
+                if n_pairs >= self.min_pairs and adev_p:
+                    worst = np.nanmax([worst, adev / adev_p])
+            rows.append({
+                "channel": ch, "n": n, "duration_s": duration_s,
+                "rate_mean": rate_mean, "rate_std": c_std / T,
+                "fano": c_std ** 2 / c_mean if c_mean else np.nan,
+                "drift_per_h": slope * 3600.0, "drift_rel": drift_rel,
+                "adev_ratio_max": worst,
+                "unstable": bool(abs(drift_rel) > self.drift_tol or worst > self.adev_tol),
+            })
+        return pd.DataFrame(rows), pd.DataFrame(adev_rows)
+
+    # ---------- whole tree ----------
+    def analyze_tree(self, data_dir):
+        """
+        Summary of every 'cuentas' CSV under data_dir, with a 'file' column (relative path).
+        A file that cannot be analyzed (no infoMedicion.txt, unreadable CSV) is skipped
+        with a warning, like the g2 loaders skip bad inputs.
+        """
+        frames = []
+        for p in find_all_csvs(data_dir):
+            try:
+                cols = [normalize_col_name(c) for c in probe_csv_header(p)["columns"]]
+                if detect_dataset_type(cols) != "cuentas":
+                    continue
+                summary, _ = self.analyze_file(p)
+            except (OSError, ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+                warnings.warn(f"stability check skipped {p}: {e}")
+                continue
+            summary.insert(0, "file", os.path.relpath(p, data_dir))
+            frames.append(summary)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["file", "channel"])
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Singles-rate stability of Cuentas (CH 1/2/3) files.")
+    ap.add_argument("csv")
+    ap.add_argument("--interval", type=float, default=None, help="acquisition interval (s); default: infoMedicion.txt")
+    ap.add_argument("--chunk-rows", type=int, default=1_000_000)
+    args = ap.parse_args()
+    summary, adev = CountsStability(interval_s=args.interval, chunk_rows=args.chunk_rows).analyze_file(args.csv)
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        print(summary)
+        print(adev)
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+class RunningStats:
+    """
+    Mergeable streaming mean/variance (count, mean, M2).
+
+    update(arr) folds a whole batch in with Chan et al.'s parallel update, so
+    per-sample arrays never need to be kept; merge(other) combines accumulators
+    built in different files/workers. Memory is O(1) per accumulator.
+    """
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n = int(n)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    def update(self, arr):
+        arr = np.asarray(arr, dtype=float)
+        nan = np.isnan(arr)
+        if nan.any():  # estimator outputs are usually NaN-free: skip the filtering copy
+            arr = arr[~nan]
+        if arr.size == 0:
+            return self
+        b_mean = float(np.mean(arr))
+        b_m2 = float(np.sum((arr - b_mean) ** 2))
+        return self._combine(arr.size, b_mean, b_m2)
+
+    def merge(self, other):
+        if other.n:
+            self._combine(other.n, other.mean, other.m2)
+        return self
+
+    def _combine(self, n_b, mean_b, m2_b):
+        n_a = self.n
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * n_b / n
+        self.m2 = self.m2 + m2_b + delta * delta * n_a * n_b / n
+        self.n = n
+        return self
+
+    def summary(self):
+        """(mean, std, sem, n) with ddof=1; (nan, nan, nan, 0) if empty, zero spread if n == 1."""
+        if self.n == 0:
+            return np.nan, np.nan, np.nan, 0
+        if self.n == 1:
+            return self.mean, 0.0, 0.0, 1
+        std = float(np.sqrt(max(self.m2, 0.0) / (self.n - 1)))
+        return self.mean, std, float(std / np.sqrt(self.n)), self.n
+
+    def to_list(self):
+        return [self.n, self.mean, self.m2]
+
+    @classmethod
+    def from_list(cls, state):
+        return cls(*state)
+
+    def __repr__(self):
+        return f"RunningStats(n={self.n}, mean={self.mean!r}, m2={self.m2!r})"
@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+SOURCES = ("coherent", "thermal", "heralded")
+
+
+def _g2_source(source, window_ns, coherence_ns, heralded_g2):
+    """Window-integrated g2 of the simulated source (what NTR/NGTR are drawn around)."""
+    if source == "coherent":
+        return 1.0
+    if source == "thermal":
+        # bunching peak of width ~coherence_ns averaged over the window
+        return 1.0 + min(1.0, coherence_ns / window_ns)
+    if source == "heralded":
+        return heralded_g2
+    raise ValueError(f"source must be one of {SOURCES}, got {source!r}")
+
+
+def _write_info(folder, interval_s, window_ns):
+    # same layout as the counter software writes
+    with open(os.path.join(folder, "infoMedicion.txt"), "w", encoding="utf-8") as fh:
+        fh.write(f"Tiempo de Prueba       : {interval_s * 1e6:.1f} us\n"
+                 f"Ventana de Coincidencia: {window_ns:g} ns")
+
+
+def _block_2d(rng, n, rate_t, rate_r, interval_s, window_ns, g2):
+    nt = rng.poisson(rate_t * interval_s, n)
+    nr = rng.poisson(rate_r * interval_s, n)
+    tau_over_T = window_ns * 1e-9 / interval_s
+    ntr = rng.poisson(nt * nr.astype(float) * tau_over_T * g2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g2_col = ntr / (nt * nr.astype(float) * tau_over_T)
+    return pd.DataFrame({"NT": nt, "NR": nr, "NTR": ntr,
+                         "g2(0)": np.where(np.isfinite(g2_col), g2_col, 0.0)})
+
+
+def _block_3d(rng, n, rate_g, eff_t, eff_r, interval_s, g2, split):
+    ng = rng.poisson(rate_g * interval_s, n)
+    ngt = rng.binomial(ng, eff_t)
+    ngr = rng.binomial(ng - ngt if split else ng, eff_r)  # split: a heralded photon goes one way only
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mu = np.where(ng > 0, g2 * ngt * ngr.astype(float) / ng, 0.0)
+    ngtr = rng.poisson(mu)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g2_col = ngtr * ng / (ngt * ngr.astype(float))
+    return pd.DataFrame({"NG": ng, "NGT": ngt, "NGR": ngr, "NGTR": ngtr,
+                         "g2(0)": np.where(np.isfinite(g2_col), g2_col, 0.0)})
+
+
+def generate_dataset(out_dir, kind="2d", source="coherent", windows_ns=(5, 10, 20, 50, 100, 200, 500),
+                     files_per_window=1, rows_per_file=200, interval_s=0.5,
+                     rate_t=16_000.0, rate_r=20_000.0, rate_g=38_000.0, eff_t=0.003, eff_r=0.004,
+                     coherence_ns=2.0, heralded_g2=0.02, seed=0, block_rows=1_000_000):
+    """
+    Write a synthetic HBT sample tree that find_all_csvs / parse_delay_from_path
+    read like the real one:
+
+        out_dir/2_detectors/2_detectors_delay_<w>[_run<i>]/HBT_2D.csv + infoMedicion.txt
+        out_dir/3_detectors/3_detectors_delay_<w>[_run<i>]/HBT_3D.csv + infoMedicion.txt
+
+    Rows are drawn vectorized in blocks of block_rows and appended, so memory is
+    bounded and 10^8 total rows is practical (disk/CSV formatting dominates).
+    Rates are in counts/s (defaults match the sample data); windows in ns.
+    Returns the list of CSV paths written.
+    """
+    assert kind in {"2d", "3d"}
+    rng = np.random.default_rng(seed)
+    sub = "2_detectors" if kind == "2d" else "3_detectors"
+    fname = "HBT_2D.csv" if kind == "2d" else "HBT_3D.csv"
+    written = []
+
+    for w in windows_ns:
+        g2 = _g2_source(source, float(w), coherence_ns, heralded_g2)
+        for i in range(files_per_window):
+            name = f"{sub}_delay_{w:g}" + (f"_run{i:03d}" if files_per_window > 1 else "")
+            folder = os.path.join(out_dir, sub, name)
+            os.makedirs(folder, exist_ok=True)
+            _write_info(folder, interval_s, float(w))
+            path = os.path.join(folder, fname)
+            first = True
+            for start in range(0, rows_per_file, block_rows):
+                n = min(block_rows, rows_per_file - start)
+                if kind == "2d":
+                    block = _block_2d(rng, n, rate_t, rate_r, interval_s, float(w), g2)
+                else:
+                    block = _block_3d(rng, n, rate_g, eff_t, eff_r, interval_s, g2,
+                                      split=(source == "heralded"))
+                block.to_csv(path, mode="w" if first else "a", header=first, index=False)
+                first = False
+            written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Generate a synthetic HBT sample tree.")
+    ap.add_argument("out_dir")
+    ap.add_argument("--kind", choices=["2d", "3d", "both"], default="both")
+    ap.add_argument("--source", choices=SOURCES, default="coherent")
+    ap.add_argument("--windows", type=float, nargs="+", default=[5, 10, 20, 50, 100, 200, 500])
+    ap.add_argument("--files-per-window", type=int, default=1)
+    ap.add_argument("--rows", type=int, default=200, help="rows per file")
+    ap.add_argument("--interval", type=float, default=0.5, help="acquisition interval (s)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    for k in (["2d", "3d"] if args.kind == "both" else [args.kind]):
+        paths = generate_dataset(args.out_dir, kind=k, source=args.source, windows_ns=args.windows,
+                                 files_per_window=args.files_per_window, rows_per_file=args.rows,
+                                 interval_s=args.interval, seed=args.seed)
+        print(f"{k}: wrote {len(paths)} files under {args.out_dir}")
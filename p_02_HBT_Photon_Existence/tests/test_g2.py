@@ -0,0 +1,65 @@
+"""Incremental g2 tables must match a fresh compute_all after any input changes."""
+import os
+
+import pandas as pd
+import pytest
+
+from p_02_HBT_Photon_Existence.g2 import G2Analyzer
+from p_02_HBT_Photon_Existence.manifest import DatasetManifest
+from p_02_HBT_Photon_Existence.synth import generate_dataset
+
+
+@pytest.fixture
+def tree(tmp_path):
+    data = tmp_path / "samples"
+    paths = generate_dataset(str(data), kind="2d", windows_ns=(5, 50, 500), rows_per_file=50)
+    return data, paths
+
+
+def _same(a, b):
+    pd.testing.assert_frame_equal(a.sort_values("delay_ns").reset_index(drop=True),
+                                  b.sort_values("delay_ns").reset_index(drop=True), check_exact=True)
+
+
+def test_info_file_edit_is_a_change(tree, tmp_path):
+    data, paths = tree
+    state = str(tmp_path / "g2_state.json")
+    an = G2Analyzer(str(data), accidentals=True)
+    an.compute_incremental(state, kinds=("2d",))
+
+    info = os.path.join(os.path.dirname(paths[0]), "infoMedicion.txt")  # delay 5
+    with open(info, "w", encoding="utf-8") as fh:
+        fh.write("Tiempo de Prueba       : 50000.0 us\nVentana de Coincidencia: 5 ns")
+    tables, changed = an.compute_incremental(state, kinds=("2d",))
+
+    assert changed["2d"] == [5.0]
+    _same(tables["2d"], an.compute_all(kinds=("2d",))["2d"])
+
+
+def test_unchanged_tree_reports_nothing(tree, tmp_path):
+    data, _ = tree
+    state = str(tmp_path / "g2_state.json")
+    an = G2Analyzer(str(data), accidentals=True)
+    an.compute_incremental(state, kinds=("2d",))
+    _, changed = an.compute_incremental(state, kinds=("2d",))
+    assert changed == {"2d": []}
+
+
+def test_chunked_state_matches_compute_all(tree, tmp_path):
+    data, _ = tree
+    state = str(tmp_path / "g2_state.json")
+    G2Analyzer(str(data), accidentals=True).compute_incremental(state, kinds=("2d",))
+    an = G2Analyzer(str(data), accidentals=True, chunk_rows=7, tail_k=2)
+    tables, changed = an.compute_incremental(state, kinds=("2d",))
+    assert changed["2d"] == [5.0, 50.0, 500.0]
+    _same(tables["2d"], an.compute_all(kinds=("2d",))["2d"])
+
+
+def test_stale_manifest_does_not_drop_files(tree, tmp_path):
+    data, _ = tree
+    manifest = str(tmp_path / "manifest.json")
+    DatasetManifest(str(data), manifest).update()
+    an = G2Analyzer(str(data), manifest_path=manifest)
+
+    generate_dataset(str(data), kind="2d", windows_ns=(20,), rows_per_file=50, seed=1)  # after the manifest
+    _same(an.compute_all(kinds=("2d",))["2d"], G2Analyzer(str(data)).compute_all(kinds=("2d",))["2d"])
@@ -0,0 +1,78 @@
+"""
+read_info_file must agree with the double-slit project's parser on every committed
+info file; the chunked CSV reader must read what read_csv_body reads.
+"""
+import glob
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from p_02_HBT_Photon_Existence.io_utils import (
+    read_info_file, probe_csv_header, read_csv_body, iter_csv_chunks
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+P02 = os.path.dirname(HERE)
+P03 = os.path.join(os.path.dirname(P02), "p_03_Double_Slit_Experiment")
+INFO_FILES = sorted(glob.glob(os.path.join(P02, "samples", "**", "infoMedicion.txt"), recursive=True)
+                    + glob.glob(os.path.join(P03, "samples", "*", "infoMedicion.txt")))
+
+
+@pytest.fixture(scope="module")
+def p03_read_info_file():
+    sys.path.insert(0, P03)
+    try:
+        from double_slit.dataio import read_info_file as reference
+    finally:
+        sys.path.remove(P03)
+    return reference
+
+
+def test_sample_info_files_exist():
+    assert INFO_FILES
+
+
+@pytest.mark.parametrize("path", INFO_FILES, ids=lambda p: os.path.relpath(p, os.path.dirname(P02)))
+def test_matches_double_slit_parser(path, p03_read_info_file):
+    T, tau = read_info_file(path)
+    if T is None or tau is None:  # the double-slit parser raises instead of returning None
+        with pytest.raises(ValueError):
+            p03_read_info_file(Path(path))
+    else:
+        assert (T, tau) == p03_read_info_file(Path(path))
+
+
+def test_known_values():
+    path = os.path.join(P02, "samples", "2_detectors", "2_detectors_delay_500", "infoMedicion.txt")
+    T, tau = read_info_file(path)
+    assert T == pytest.approx(0.5)
+    assert tau == 500.0
+
+
+def test_missing_values_are_none(tmp_path):
+    path = tmp_path / "infoMedicion.txt"
+    path.write_text("Cuentas por canal\n", encoding="utf-8")
+    assert read_info_file(str(path)) == (None, None)
+
+
+def _latin1_csv(path, n_rows, note_row, header="NT,NR,NTR,Descripción"):
+    rows = [f"{i},{2 * i},{i % 7},{'señal' if i == note_row else 'ok'}" for i in range(n_rows)]
+    path.write_bytes((header + "\n" + "\n".join(rows) + "\n").encode("latin-1"))
+    return str(path)
+
+
+@pytest.mark.parametrize("header,note_row", [
+    ("NT,NR,NTR,Descripción", 0),       # latin-1 header: the probe sees it
+    ("NT,NR,NTR,Descripción", 50000),
+    ("NT,NR,NTR,Nota", 50000),          # ASCII head: fails mid-stream, after many chunks
+], ids=["latin1_header", "latin1_header_and_body", "latin1_after_probe"])
+def test_chunks_fall_back_to_latin1(tmp_path, header, note_row):
+    path = _latin1_csv(tmp_path / "HBT_2D.csv", 60000, note_row, header)
+    header = probe_csv_header(path)
+    whole = read_csv_body(path, header)
+    chunks = pd.concat(iter_csv_chunks(path, header, 500), ignore_index=True)
+    pd.testing.assert_frame_equal(chunks, whole)
+    assert chunks.iloc[note_row, -1] == "señal"
@@ -0,0 +1,30 @@
+"""LiveG2Monitor must read a growing file with the same dialect as batch ingestion."""
+import pytest
+
+from p_02_HBT_Photon_Existence.io_utils import probe_csv_header
+from p_02_HBT_Photon_Existence.live import LiveG2Monitor
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    folder = tmp_path / "2_detectors_delay_20"
+    folder.mkdir()
+    return folder / "HBT_2D.csv"
+
+
+def test_separator_matches_batch_probe(csv_path):
+    # more commas than semicolons in the header: only the sniffer gets this right
+    csv_path.write_text('NT;NR;NTR;"g2(0), a, b, c, d"\n', encoding="utf-8")
+    mon = LiveG2Monitor(str(csv_path))
+    assert mon.poll_once() == 0 and mon.columns is None  # waits for a data line
+
+    with open(csv_path, "a", encoding="utf-8") as fh:
+        fh.write("100;200;3;1.5\n120;210;4;1.6\n12")  # last row still being written
+    assert mon.poll_once() == 2
+    assert mon.header["sep"] == probe_csv_header(str(csv_path))["sep"] == ";"
+    assert mon.kind == "2d"
+
+    with open(csv_path, "a", encoding="utf-8") as fh:
+        fh.write("0;220;5;1.7\n")
+    assert mon.poll_once() == 1
+    assert mon.n_rows == 3 and mon.file.mean == pytest.approx(1.6)
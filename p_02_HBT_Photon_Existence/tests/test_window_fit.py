@@ -0,0 +1,32 @@
+"""G2WindowFitter: failure reasons are reported separately."""
+import numpy as np
+import pandas as pd
+
+from p_02_HBT_Photon_Existence.window_fit import G2WindowFitter, model
+
+W = np.array([5, 10, 20, 50, 100, 200, 500.0])
+
+
+def _table(tau_c, w=W):
+    y = model(w, [1.0, 0.8, tau_c]) + 1e-3 * np.sin(w)
+    return pd.DataFrame({"delay_ns": w, "g2_file_norm": y, "g2_file_norm_sem": np.full(len(w), 1e-3)})
+
+
+def test_failure_flags():
+    fits = G2WindowFitter().fit({"ok": _table(30.0), "few": _table(30.0).head(3),
+                                 "empty": _table(30.0).head(0)}).set_index("name")
+    assert fits.loc["ok", "identifiable"] and fits.loc["ok", "converged"]
+    assert abs(fits.loc["ok", "g2_0"] - 1.8) < 5 * fits.loc["ok", "g2_0_err"]
+    for name in ("few", "empty"):
+        assert fits.loc[name, "n_points"] < 4
+        assert not fits.loc[name, "identifiable"] and not fits.loc[name, "converged"]
+        assert np.isnan(fits.loc[name, "g2_0"])
+
+
+def test_flat_data_is_not_identifiable():
+    flat = pd.DataFrame({"delay_ns": W, "g2_file_norm": 1.0 + 1e-3 * np.sin(W),
+                         "g2_file_norm_sem": np.full(len(W), 1e-3)})
+    r = G2WindowFitter().fit(flat).iloc[0]
+    assert r["n_points"] == len(W)
+    assert not r["identifiable"] and not r["converged"]
+    assert np.isnan(r["g2_0_err"])
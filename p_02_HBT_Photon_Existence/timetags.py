@@ -0,0 +1,186 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from p_02_HBT_Photon_Existence.g2 import G2Analyzer
+from p_02_HBT_Photon_Existence.stats import RunningStats
+
+
+def load_timestamps(path, dtype="<i8"):
+    """
+    Load one channel's photon time tags (sorted, in time-tagger ticks).
+
+    - .npy          : memory-mapped via np.load(mmap_mode="r")
+    - .bin/.dat/.raw: raw little-endian array of `dtype`, memory-mapped
+    - .csv/.txt     : first column (a non-numeric header line is ignored)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        arr = np.load(path, mmap_mode="r")
+    elif ext in {".bin", ".dat", ".raw"}:
+        arr = np.memmap(path, dtype=np.dtype(dtype), mode="r")
+    else:
+        col = pd.read_csv(path, sep=None, engine="python", header=None).iloc[:, 0]
+        arr = pd.to_numeric(col, errors="coerce").dropna().to_numpy()
+    return _ensure_sorted(arr)
+
+
+def _ensure_sorted(t):
+    # time taggers emit sorted streams; only pay for a sort if one is not
+    if t.size > 1 and np.any(t[1:] < t[:-1]):
+        return np.sort(t)
+    return t
+
+
+def _pair_lags(t_a, t_b, max_lag):
+    """
+    All (a, b) pairs with |t_b - t_a| <= max_lag, via two searchsorted passes:
+    O((n_a + n_pairs) log n_b). Returns (index into t_a, lag t_b - t_a).
+    """
+    lo = np.searchsorted(t_b, t_a - max_lag, side="left")
+    hi = np.searchsorted(t_b, t_a + max_lag, side="right")
+    cnt = hi - lo
+    total = int(cnt.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=float)
+    ia = np.repeat(np.arange(t_a.size), cnt)
+    # position of each pair inside its run -> index into t_b
+    starts = np.cumsum(cnt) - cnt
+    ib = lo[ia] + (np.arange(total) - starts[ia])
+    lag = np.asarray(t_b[ib], dtype=float) - np.asarray(t_a[ia], dtype=float)
+    return ia, lag
+
+
+def _has_partner(t_ref, t_other, half_window):
+    """Boolean per t_ref click: is there any t_other click within ±half_window?"""
+    lo = np.searchsorted(t_other, t_ref - half_window, side="left")
+    hi = np.searchsorted(t_other, t_ref + half_window, side="right")
+    return hi > lo
+
+
+class TimeTagG2:
+    """
+    g2 from raw per-channel time tags instead of pre-binned counts.
+
+    The acquisition is cut into intervals of interval_s (like the counter's
+    "Tiempo de Prueba"); for every coincidence window the per-interval counts
+    (NT, NR, NTR) or (NG, NGT, NGR, NGTR) are built with searchsorted and fed
+    to the same per-sample estimators and aggregation as G2Analyzer, so
+    window_table() returns the G2Analyzer.compute schema (delay_ns = window).
+
+    Timestamps are in ticks of time_unit_ns (e.g. 1e-3 for picosecond tags).
+    """
+
+    def __init__(self, interval_s=0.5, time_unit_ns=1.0, normalize=True, tail_k=3):
+        self.interval_s = float(interval_s)
+        self.time_unit_ns = float(time_unit_ns)
+        self._agg = G2Analyzer(data_dir=None, normalize=normalize, tail_k=tail_k)
+
+    # ---------- helpers ----------
+    def _ticks(self, ns):
+        return ns / self.time_unit_ns
+
+    def _interval_index(self, channels):
+        """Interval id per click for each channel; clicks in the trailing partial interval get -1."""
+        t0 = min(float(t[0]) for t in channels if t.size)
+        t1 = max(float(t[-1]) for t in channels if t.size)
+        width = self._ticks(self.interval_s * 1e9)
+        n_int = max(1, int((t1 - t0) // width))
+        out = []
+        for t in channels:
+            idx = ((np.asarray(t, dtype=float) - t0) // width).astype(np.int64)
+            idx[idx >= n_int] = -1
+            out.append(idx)
+        return out, n_int
+
+    @staticmethod
+    def _bincount(idx, n_int, mask=None):
+        keep = idx >= 0 if mask is None else (idx >= 0) & mask
+        return np.bincount(idx[keep], minlength=n_int)
+
+    def _window_frames(self, kind, channels, windows_ns):
+        """Yield (window_ns, per-interval DataFrame in normalized G2Analyzer columns)."""
+        idx, n_int = self._interval_index(channels)
+        T_s = self.interval_s
+
+        if kind == "2d":
+            t_t, t_r = channels
+            nt = self._bincount(idx[0], n_int)
+            nr = self._bincount(idx[1], n_int)
+            half_max = self._ticks(max(windows_ns) / 2.0)
+            ia, lag = _pair_lags(t_t, t_r, half_max)
+            pair_int = idx[0][ia]
+            for w in windows_ns:
+                ntr = self._bincount(pair_int, n_int, np.abs(lag) <= self._ticks(w / 2.0))
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    g2 = ntr * (T_s / (w * 1e-9)) / (nt.astype(float) * nr)
+                yield w, pd.DataFrame({"nt": nt, "nr": nr, "ntr": ntr,
+                                       "g2(0)": np.where(np.isfinite(g2), g2, np.nan)})
+
+        elif kind == "3d":
+            t_g, t_t, t_r = channels
+            ng = self._bincount(idx[0], n_int)
+            for w in windows_ns:
+                half = self._ticks(w / 2.0)
+                hit_t = _has_partner(t_g, t_t, half)
+                hit_r = _has_partner(t_g, t_r, half)
+                ngt  = self._bincount(idx[0], n_int, hit_t)
+                ngr  = self._bincount(idx[0], n_int, hit_r)
+                ngtr = self._bincount(idx[0], n_int, hit_t & hit_r)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    g2 = ngtr * ng / (ngt.astype(float) * ngr)
+                yield w, pd.DataFrame({"ng": ng, "ngt": ngt, "ngr": ngr, "ngtr": ngtr,
+                                       "g2(0)": np.where(np.isfinite(g2), g2, np.nan)})
+        else:
+            raise ValueError(f"kind must be '2d' or '3d', got {kind!r}")
+
+    # ---------- main API ----------
+    def window_table(self, kind, channels, windows_ns):
+        """
+        kind="2d": channels = (t_T, t_R); kind="3d": channels = (t_G, t_T, t_R).
+        Returns the aggregated table by window, same columns as G2Analyzer.compute.
+        """
+        channels = [_ensure_sorted(np.asarray(t)) for t in channels]
+        bucket = {}
+        for w, dfn in self._window_frames(kind, channels, sorted(windows_ns)):
+            rec = bucket.setdefault(float(w), {"counts": RunningStats(), "file": RunningStats()})
+            rec["counts"].update(self._agg._g2_per_sample_counts(dfn, kind))
+            rec["file"].update(self._agg._g2_per_sample_file(dfn, "g2(0)"))
+        df = self._agg._collapse_records(bucket)
+        return self._agg._add_normalized(df)
+
+    def histogram(self, t_a, t_b, max_lag_ns=100.0, bin_ns=1.0):
+        """
+        Coincidence histogram C(τ) of τ = t_b - t_a over ±max_lag_ns and the
+        accidentals-normalized g2(τ) = C(τ) · T_total / (N_a · N_b · Δτ).
+        Returns DataFrame(tau_ns, coincidences, g2).
+        """
+        t_a = _ensure_sorted(np.asarray(t_a))
+        t_b = _ensure_sorted(np.asarray(t_b))
+        max_lag = self._ticks(max_lag_ns)
+        _, lag = _pair_lags(t_a, t_b, max_lag)
+        nbins = int(round(2 * max_lag_ns / bin_ns))
+        counts, edges = np.histogram(lag * self.time_unit_ns, bins=nbins, range=(-max_lag_ns, max_lag_ns))
+        if t_a.size == 0 or t_b.size == 0:
+            return pd.DataFrame({"tau_ns": 0.5 * (edges[:-1] + edges[1:]),
+                                 "coincidences": counts, "g2": np.full(nbins, np.nan)})
+        span_ns = (max(float(t_a[-1]), float(t_b[-1])) - min(float(t_a[0]), float(t_b[0]))) * self.time_unit_ns
+        width = edges[1] - edges[0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g2 = counts * span_ns / (float(t_a.size) * t_b.size * width)
+        return pd.DataFrame({"tau_ns": 0.5 * (edges[:-1] + edges[1:]),
+                             "coincidences": counts, "g2": g2})
+
+    def heralded_histogram(self, t_g, t_t, t_r, herald_window_ns, max_lag_ns=100.0, bin_ns=1.0):
+        """
+        Heralded g2(τ): T and R clicks are first gated on a herald G within
+        ±herald_window_ns/2, then histogram() is applied to the gated streams.
+        """
+        t_g = _ensure_sorted(np.asarray(t_g))
+        t_t = _ensure_sorted(np.asarray(t_t))
+        t_r = _ensure_sorted(np.asarray(t_r))
+        half = self._ticks(herald_window_ns / 2.0)
+        return self.histogram(t_t[_has_partner(t_t, t_g, half)],
+                              t_r[_has_partner(t_r, t_g, half)],
+                              max_lag_ns=max_lag_ns, bin_ns=bin_ns)
@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+PARAMS = ("B", "A", "tau_c_ns")
+
+
+def _avg_factor(w, tau_c):
+    """f(u) = (1 - exp(-u)) / u with u = w / tau_c, and df/du (stable for small u)."""
+    u = w / tau_c
+    small = u < 1e-6
+    u_safe = np.where(small, 1.0, u)
+    f = np.where(small, 1.0 - 0.5 * u, -np.expm1(-u_safe) / u_safe)
+    dfdu = np.where(small, -0.5 + u / 3.0, (np.exp(-u_safe) * (u_safe + 1.0) - 1.0) / u_safe**2)
+    return f, dfdu
+
+
+def model(w, params):
+    """
+    Window-averaged g2: a feature A*exp(-|t|/tau_c) on a flat (accidental) level B,
+    averaged over a coincidence window w:
+
+        g2(w) = B + A * tau_c/w * (1 - exp(-w/tau_c)),   g2(w -> 0) = B + A
+
+    w: (..., M) windows in ns; params: (..., 3) = (B, A, tau_c_ns). Broadcasts over sessions.
+    """
+    params = np.asarray(params, dtype=float)
+    B, A, tc = params[..., 0:1], params[..., 1:2], params[..., 2:3]
+    f, _ = _avg_factor(np.asarray(w, dtype=float), tc)
+    return B + A * f
+
+
+def jacobian(w, params):
+    """Analytic d model / d (B, A, tau_c): shape (..., M, 3)."""
+    params = np.asarray(params, dtype=float)
+    w = np.asarray(w, dtype=float)
+    A, tc = params[..., 1:2], params[..., 2:3]
+    f, dfdu = _avg_factor(w, tc)
+    d_tc = A * dfdu * (-w / tc**2)
+    return np.stack(np.broadcast_arrays(np.ones_like(f), f, d_tc), axis=-1)
+
+
+class G2WindowFitter:
+    """
+    Fit g2 vs coincidence window for many tables (2d/3d, sessions) in one batched call.
+
+    Tables (from G2Analyzer.compute) are padded to a common length with zero
+    weights, so every step is one vectorized model/Jacobian evaluation over all
+    sessions. Start values come from a tau_c grid where (B, A) are solved by
+    weighted linear least squares (variable projection); a batched
+    Levenberg-Marquardt with the analytic Jacobian then refines them.
+
+    Points are weighted by 1/sem^2 of the chosen series; points with missing or
+    zero sem (e.g. an all-zero window) are left out. Uncertainties are
+    curve_fit-style (covariance scaled by reduced chi^2), and
+    g2(0) = B + A carries the (B, A) covariance.
+
+    tau_c is bounded below by min_tau_frac x the smallest window: a feature much
+    narrower than every window only constrains the product A*tau_c. A fit that
+    ends on that bound, or whose (B, A, tau_c) normal matrix is ill-conditioned
+    (cond > max_cond after scaling to unit diagonal), is not identifiable: its
+    errors are NaN and converged is False.
+    """
+
+    def __init__(self, series="file", normalized=True, max_iter=200, tol=1e-10, n_grid=40,
+                 min_tau_frac=0.1, max_cond=1e8):
+        self.series = series
+        self.normalized = normalized
+        self.max_iter = max_iter
+        self.tol = tol
+        self.n_grid = n_grid
+        self.min_tau_frac = min_tau_frac
+        self.max_cond = max_cond
+
+    def _columns(self):
+        s = f"g2_{self.series}"
+        return (f"{s}_norm", f"{s}_norm_sem") if self.normalized else (f"{s}_mean", f"{s}_sem")
+
+    # ---------- batching ----------
+    def _stack(self, tables):
+        """Padded (w, y, weight) arrays of shape (N, M) from {name: DataFrame}."""
+        ycol, ecol = self._columns()
+        rows = []
+        for df in tables.values():
+            if df is None or df.empty or ycol not in df.columns:
+                rows.append((np.array([]), np.array([]), np.array([])))
+                continue
+            w = df["delay_ns"].to_numpy(dtype=float)
+            y = df[ycol].to_numpy(dtype=float)
+            e = df[ecol].to_numpy(dtype=float) if ecol in df.columns else np.ones_like(y)
+            ok = np.isfinite(w) & (w > 0) & np.isfinite(y) & np.isfinite(e) & (e > 0)
+            rows.append((w[ok], y[ok], 1.0 / e[ok] ** 2))
+        M = max([len(r[0]) for r in rows] + [1])
+        W, Y, Wt = (np.ones((len(rows), M)), np.zeros((len(rows), M)), np.zeros((len(rows), M)))
+        for i, (w, y, wt) in enumerate(rows):
+            W[i, :len(w)], Y[i, :len(w)], Wt[i, :len(w)] = w, y, wt
+        return W, Y, Wt
+
+    def _tau_min(self, W, Wt):
+        """Lower bound of tau_c per table: min_tau_frac x its smallest usable window."""
+        lo = np.nanmin(np.where(Wt > 0, W, np.nan), axis=1, initial=np.inf) * self.min_tau_frac
+        return np.where(np.isfinite(lo), lo, 1.0)
+
+    def _initial(self, W, Y, Wt):
+        """Best (B, A, tau_c) over a log grid of tau_c, with (B, A) linear at each grid point."""
+        valid = Wt > 0
+        lo = self._tau_min(W, Wt)
+        hi = np.nanmax(np.where(valid, W, np.nan), axis=1, initial=-np.inf)
+        hi = np.where(np.isfinite(hi) & (hi > lo), hi, 10.0 * lo)
+        grid = np.exp(np.linspace(np.log(lo), np.log(hi), self.n_grid)).T  # (N, G)
+        f, _ = _avg_factor(W[:, None, :], grid[:, :, None])                  # (N, G, M)
+        X = np.stack([np.ones_like(f), f], axis=-1)                          # (N, G, M, 2)
+        XtW = X * Wt[:, None, :, None]
+        lhs = np.einsum("ngmi,ngmj->ngij", XtW, X) + 1e-12 * np.eye(2)
+        rhs = np.einsum("ngmi,nm->ngi", XtW, Y)
+        ba = np.linalg.solve(lhs, rhs[..., None])[..., 0]                    # (N, G, 2)
+        resid = Y[:, None, :] - np.einsum("ngmi,ngi->ngm", X, ba)
+        chi2 = np.sum(Wt[:, None, :] * resid**2, axis=-1)
+        best = np.argmin(chi2, axis=1)
+        idx = np.arange(len(W))
+        return np.column_stack([ba[idx, best, 0], ba[idx, best, 1], grid[idx, best]])
+
+    def _lm(self, W, Y, Wt, p):
+        """Batched Levenberg-Marquardt; returns (params, chi2, converged)."""
+        lam = np.full(len(W), 1e-3)
+        chi2 = np.sum(Wt * (Y - model(W, p)) ** 2, axis=1)
+        done = np.zeros(len(W), dtype=bool)
+        eye = np.eye(3)
+        tau_min = self._tau_min(W, Wt)
+        for _ in range(self.max_iter):
+            J = jacobian(W, p)
+            r = Y - model(W, p)
+            JtW = J * Wt[..., None]
+            H = np.einsum("nmi,nmj->nij", JtW, J)
+            g = np.einsum("nmi,nm->ni", JtW, r)
+            diag = np.einsum("nii->ni", H)
+            Hd = H + lam[:, None, None] * (diag[:, :, None] * eye + 1e-12 * eye)
+            step = np.linalg.solve(Hd, g[..., None])[..., 0]
+            trial = p + step
+            trial[:, 2] = np.maximum(trial[:, 2], tau_min)  # tau_c >= min_tau_frac * min(w)
+            chi2_t = np.sum(Wt * (Y - model(W, trial)) ** 2, axis=1)
+            better = (chi2_t <= chi2) & ~done
+            rel = np.abs(chi2 - chi2_t) / np.maximum(chi2, 1e-300)
+            p = np.where(better[:, None], trial, p)
+            done |= better & (rel < self.tol)
+            chi2 = np.where(better, chi2_t, chi2)
+            lam = np.where(better, lam * 0.3, lam * 10.0)
+            done |= lam > 1e12  # no downhill step left: at a minimum to working precision
+            if done.all():
+                break
+        return p, chi2, done
+
+    # ---------- main API ----------
+    def fit(self, tables):
+        """
+        tables: a DataFrame, a list of DataFrames, or {name: DataFrame}.
+        Returns one row per table: name, B, A, tau_c_ns (+ *_err), g2_0, g2_0_err,
+        chi2_red, n_points, identifiable, converged. Tables with fewer than 4 usable
+        points get NaNs (identifiable and converged False); unidentifiable fits keep
+        their point estimates but get NaN errors, identifiable=False and converged=False.
+        """
+        if isinstance(tables, pd.DataFrame):
+            tables = {"table": tables}
+        elif not isinstance(tables, dict):
+            tables = {i: df for i, df in enumerate(tables)}
+        W, Y, Wt = self._stack(tables)
+        n_pts = (Wt > 0).sum(axis=1)
+        p, chi2, conv = self._lm(W, Y, Wt, self._initial(W, Y, Wt))
+
+        J = jacobian(W, p)
+        H = np.einsum("nmi,nmj->nij", J * Wt[..., None], J)
+        dof = n_pts - 3
+        with np.errstate(divide="ignore", invalid="ignore"):
+            chi2_red = np.where(dof > 0, chi2 / dof, np.nan)
+            # conditioning of the scaled normal matrix; a degenerate direction means no error bars
+            d = np.sqrt(np.einsum("nii->ni", H))
+            Hs = H / (d[:, :, None] * d[:, None, :])
+            Hs = np.where(np.isfinite(Hs), Hs, 0.0)
+            cond = np.linalg.cond(Hs)
+            identifiable = (np.all(d > 0, axis=1) & np.isfinite(cond) & (cond < self.max_cond)
+                            & (p[:, 2] > self._tau_min(W, Wt) * (1.0 + 1e-6)))
+            Hs[~identifiable] = np.eye(3)  # placeholder so the batched inverse never fails
+            cov = np.linalg.inv(Hs) / (d[:, :, None] * d[:, None, :]) * chi2_red[:, None, None]
+        cov[~identifiable] = np.nan
+        conv = conv & identifiable
+        err = np.sqrt(np.einsum("nii->ni", cov))
+        g2_0 = p[:, 0] + p[:, 1]
+        g2_0_err = np.sqrt(cov[:, 0, 0] + cov[:, 1, 1] + 2 * cov[:, 0, 1])
+
+        out = pd.DataFrame({"name": list(tables)})
+        for j, name in enumerate(PARAMS):
+            out[name] = p[:, j]
+            out[f"{name}_err"] = err[:, j]
+        out["g2_0"], out["g2_0_err"] = g2_0, g2_0_err
+        out["chi2_red"], out["n_points"] = chi2_red, n_pts
+        out["identifiable"], out["converged"] = identifiable, conv
+        bad = dof <= 0
+        keep = ("name", "n_points", "identifiable", "converged")
+        out.loc[bad, [c for c in out.columns if c not in keep]] = np.nan
+        out.loc[bad, ["identifiable", "converged"]] = False
+        return out
+
+    def curve(self, fit_row, w):
+        """Model values at windows w for one row of fit()."""
+        return model(np.asarray(w, dtype=float), [fit_row[k] for k in PARAMS])
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Tuple
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Tuple
 
 import pandas as pd
 
@@ -11,17 +11,23 @@ from .config import ExperimentConfig
 from .dataio import DoubleSlitDataset
 from .preprocess import CoincidencePreprocessor, build_summary
 from .models import Eq9Model
-from .fitters import DoubleSlitFitter, FitResult
-from .plotting import DoubleSlitPlotter
+from .profiling import StageProfiler
+
+if TYPE_CHECKING:  # fitters (scipy) and plotting (matplotlib) are imported only when used
+    from .fitters import FitResult
 
 
 @dataclass
 class DoubleSlitAnalysis:
     """
     High-level orchestration of the double-slit experiment analysis.
+
+    ``profiler`` times the load / preprocess / fit / plot stages when enabled
+    (see :class:`StageProfiler`); it is a no-op by default.
     """
 
     config: ExperimentConfig
+    profiler: StageProfiler = field(default_factory=StageProfiler)
 
     def run_full_analysis(self) -> Tuple[pd.DataFrame, FitResult | None]:
         """
@@ -30,8 +36,12 @@ class DoubleSlitAnalysis:
             - load raw data,
             - subtract accidentals (optional),
             - build summary DataFrame,
-            - fit Eq. (9) (optional, depending on config.perform_fit),
-            - make plots.
+            - fit Eq. (9) (optional, depending on config.perform_fit; from
+              config.multistart initial guesses if it is > 1),
+            - make plots (optional, depending on config.make_plots).
+
+        scipy and matplotlib are only imported by the fit and plot steps,
+        so a tables-only run (both options off) starts without them.
 
         Returns
         -------
@@ -40,23 +50,43 @@ class DoubleSlitAnalysis:
         fit_result : FitResult or None
             Fit result if config.perform_fit is True, else None.
         """
+        prof = self.profiler
+
         # 1) Load all positions
-        dataset = DoubleSlitDataset(self.config)
-        dataset.load_positions()
+        with prof.stage("load"):
+            dataset = DoubleSlitDataset(self.config)
+            dataset.load_positions()
 
         # 2) Preprocess + build summary
-        preproc = CoincidencePreprocessor(self.config)
-        summary = build_summary(dataset, preproc)
+        with prof.stage("preprocess"):
+            preproc = CoincidencePreprocessor(self.config)
+            summary = build_summary(dataset, preproc)
 
-        # 3) Build model, fitter, plotter
+        # 3) Build model (fitter and plotter only if needed)
         model = Eq9Model(self.config)
-        plotter = DoubleSlitPlotter(self.config, model)
 
         fit_result: FitResult | None = None
 
         if self.config.perform_fit:
-            fitter = DoubleSlitFitter(self.config, model)
-            fit_result = fitter.fit_counts(summary)
+            from .fitters import DoubleSlitFitter
+
+            with prof.stage("fit"):
+                fitter = DoubleSlitFitter(self.config, model)
+                if self.config.multistart > 1:
+                    multi = fitter.fit_counts_multistart(summary)
+                    fit_result = multi.best
+                else:
+                    fit_result = fitter.fit_counts(summary)
+
+            if self.config.multistart > 1:
+                print(
+                    f"\nMulti-start: {multi.n_converged}/{len(multi.starts)} fits converged, "
+                    f"{len(multi.minima)} distinct minima, {len(multi.at_bound)} stopped on a bound"
+                )
+                for m in multi.minima + multi.at_bound:
+                    values = ", ".join(f"{k}={v:.4g}" for k, v in m.params.items())
+                    flag = f"   [on bound: {', '.join(m.at_bound)}]" if m.at_bound else ""
+                    print(f"  chi2 = {m.chi2:10.4g}   {values}{flag}")
 
             # Optionally, you can print a small fit summary:
             perr = None
@@ -71,10 +101,17 @@ class DoubleSlitAnalysis:
 
             # You could also compute a reduced chi^2 here if you like.
 
-        # 4) Plot coincidences vs position (with or without fit overlay)
-        plotter.plot_counts_with_fit(summary, fit_result, show=True)
+        if self.config.make_plots:
+            from .plotting import DoubleSlitPlotter
+
+            plotter = DoubleSlitPlotter(self.config, model)
+
+            # 4) Plot coincidences vs position (with or without fit overlay)
+            with prof.stage("plot_counts"):
+                plotter.plot_counts_with_fit(summary, fit_result, show=True)
 
-        # 5) Plot g2(0) vs position
-        plotter.plot_g2_vs_position(summary, show=True)
+            # 5) Plot g2(0) vs position
+            with prof.stage("plot_g2"):
+                plotter.plot_g2_vs_position(summary, show=True)
 
         return summary, fit_result
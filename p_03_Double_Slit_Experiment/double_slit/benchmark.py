@@ -0,0 +1,152 @@
+# double_slit/benchmark.py
+
+"""
+Benchmark of the Eq. (9) fits: analytic Jacobian (fused evaluator) vs
+scipy's finite differences.
+
+Run from the project folder:
+
+    python -m double_slit.benchmark [--points 84 400 2000] [--repeat 20]
+                                    [--real] [--out fit_benchmark.json]
+
+Each case fits a synthetic scan drawn from the model itself (fixed seed);
+--real also fits the summary of the samples/ folder. For both Jacobian modes
+it reports best-of-repeat wall time, optimizer iterations (curve_fit nfev),
+model evaluations (finite differences add one per parameter per iteration)
+and the largest parameter difference between the two modes, in units of the
+parameter's standard error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .config import ExperimentConfig, make_default_config
+from .fitters import DoubleSlitFitter, FitResult
+from .models import Eq9Fused, Eq9Model
+
+# true parameters of the synthetic scans (extended model; basic uses the first three)
+_TRUTH = {"N0": 15.0, "V": 0.7, "delta": 0.2, "x_scale": 1.05, "N_bg": 9.0}
+
+
+@dataclass
+class CountingEq9Model(Eq9Model):
+    """Eq9Model that counts model evaluations (plain calls + fused evaluations)."""
+
+    calls: int = 0
+    _fused: List[Eq9Fused] = field(default_factory=list, repr=False)
+
+    def counts_basic(self, *args, **kwargs):
+        self.calls += 1
+        return super().counts_basic(*args, **kwargs)
+
+    def counts_extended(self, *args, **kwargs):
+        self.calls += 1
+        return super().counts_extended(*args, **kwargs)
+
+    def fused(self, x_mm, extended):
+        fused = super().fused(x_mm, extended)
+        self._fused.append(fused)
+        return fused
+
+    def evaluations(self) -> int:
+        return self.calls + sum(f.n_evals for f in self._fused)
+
+    def reset(self) -> None:
+        self.calls = 0
+        self._fused.clear()
+
+
+def synthetic_summary(config: ExperimentConfig, n_points: int, seed: int = 0) -> pd.DataFrame:
+    """Summary-like table (x_mm, N_mean, N_sem) sampled from the extended model."""
+    rng = np.random.default_rng(seed)
+    x_mm = np.linspace(-8.0, 8.0, n_points)
+    mean = Eq9Model(config).counts_extended(x_mm, **_TRUTH)
+    n_intervals = 50
+    sem = np.sqrt(mean / n_intervals)
+    return pd.DataFrame({"x_mm": x_mm, "N_mean": mean + sem * rng.standard_normal(n_points), "N_sem": sem})
+
+
+def real_summary(config: ExperimentConfig) -> pd.DataFrame:
+    """Summary of the measured scan under config.data_base_dir."""
+    from .dataio import DoubleSlitDataset
+    from .preprocess import CoincidencePreprocessor, build_summary
+
+    dataset = DoubleSlitDataset(config)
+    dataset.load_positions()
+    return build_summary(dataset, CoincidencePreprocessor(config))
+
+
+def bench_case(
+    config: ExperimentConfig,
+    summary: pd.DataFrame,
+    extended: bool,
+    repeat: int = 20,
+) -> Dict[str, object]:
+    """Fit ``summary`` with both Jacobian modes; one result dict per case."""
+    out: Dict[str, object] = {"model": "extended" if extended else "basic", "n_points": len(summary)}
+    fits: Dict[str, FitResult] = {}
+    for mode, analytic in (("finite_diff", False), ("analytic", True)):
+        config.use_extended_model = extended
+        config.analytic_jacobian = analytic
+        model = CountingEq9Model(config)
+        fitter = DoubleSlitFitter(config, model)
+
+        best = float("inf")
+        for _ in range(repeat):
+            model.reset()
+            t0 = time.perf_counter()
+            fits[mode] = fitter.fit_counts(summary)
+            best = min(best, time.perf_counter() - t0)
+        out[mode] = {"seconds": best, "nfev": fits[mode].nfev, "model_evals": model.evaluations()}
+
+    ref, new = fits["finite_diff"], fits["analytic"]
+    err = np.sqrt(np.diag(ref.cov))
+    diff = [abs(new.params[k] - ref.params[k]) / e for k, e in zip(ref.params, err)]
+    out["speedup"] = out["finite_diff"]["seconds"] / out["analytic"]["seconds"]
+    out["max_param_diff_sigma"] = float(max(diff))
+    return out
+
+
+def run(points=(84, 400, 2000), repeat: int = 20, real: bool = False) -> List[dict]:
+    config = make_default_config()
+    config.fit_region = "full"
+    cases = [(f"synthetic[{n}]", synthetic_summary(config, n)) for n in points]
+    if real:
+        cases.append(("samples", real_summary(config)))
+
+    results = []
+    for name, summary in cases:
+        for extended in (False, True):
+            res = {"case": name, **bench_case(config, summary, extended, repeat)}
+            results.append(res)
+            fd, an = res["finite_diff"], res["analytic"]
+            print(
+                f"{name:16s} {res['model']:8s} "
+                f"fd {fd['seconds'] * 1e3:8.2f} ms  nfev {fd['nfev']:3d}  evals {fd['model_evals']:4d} | "
+                f"analytic {an['seconds'] * 1e3:8.2f} ms  nfev {an['nfev']:3d}  evals {an['model_evals']:4d} | "
+                f"x{res['speedup']:.2f}  dparam {res['max_param_diff_sigma']:.1e} sigma"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark analytic vs finite-difference Eq. (9) fits.")
+    parser.add_argument("--points", nargs="+", type=int, default=[84, 400, 2000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--real", action="store_true", help="also fit the measured samples/ scan")
+    parser.add_argument("--out", default=None, metavar="JSON", help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.points, args.repeat, args.real)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"Results written to {args.out}")
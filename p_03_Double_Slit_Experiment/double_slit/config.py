@@ -34,8 +34,20 @@ class ExperimentConfig:
     perform_fit: bool = True             # do we actually run the regression?
     use_extended_model: bool = True      # include x_scale, N_bg, etc. (later)
     fit_region: str = "full"             # "full", "up_to_center", etc.
+    analytic_jacobian: bool = True       # exact Jacobian in curve_fit (False = finite differences)
+
+    # --- Multi-start fitting (0 or 1 = single fit from the default guess) ---
+    multistart: int = 0                  # number of initial guesses (row 0 = default guess)
+    multistart_method: str = "lhs"       # "lhs" (Latin hypercube) or "grid" over V, delta, x_scale
+    multistart_workers: int = 4          # processes running the starts (1 = serial)
+    multistart_seed: int = 0             # Latin-hypercube seed (fixed -> deterministic)
+
+    # --- Loading options ---
+    load_workers: int = 4                # threads reading position folders (1 = serial)
+    scan_store: Path | None = None       # single columnar file of the whole scan (None = off)
 
     # --- Plotting options ---
+    make_plots: bool = True              # False: no figures (matplotlib is never imported)
     save_figures: bool = True
     fig_dir: Path | None = None          # where to save figures (if None, project_root)
 
@@ -46,6 +58,8 @@ class ExperimentConfig:
         """
         self.project_root = self.project_root.expanduser().resolve()
         self.data_base_dir = self.data_base_dir.expanduser().resolve()
+        if self.scan_store is not None:
+            self.scan_store = self.scan_store.expanduser().resolve()
         if self.fig_dir is None:
             self.fig_dir = self.project_root / "figures"
         else:
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -12,18 +13,35 @@ import pandas as pd
 from .config import ExperimentConfig
 
 
-@dataclass
+def narrowest_int(values: np.ndarray) -> np.ndarray:
+    """
+    ``values`` in the smallest integer dtype that holds its range
+    (e.g. counts 0..40 -> uint8); non-integer arrays are returned unchanged.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind not in "iu" or values.size == 0:
+        return values
+    dtype = np.result_type(np.min_scalar_type(values.min()), np.min_scalar_type(values.max()))
+    return values.astype(dtype, copy=False)
+
+
+@dataclass(slots=True)
 class PositionData:
     """
     Raw data for ONE position (one numeric folder under 'samples/').
 
+    The rows are kept as plain 1-D arrays (no DataFrame per position);
+    integer counts are stored in the narrowest dtype that holds them, and
+    after ``DoubleSlitDataset.load_positions`` the arrays are views into the
+    dataset's shared column block. Derived quantities (accidentals, true
+    coincidences) are computed on demand by :meth:`accidentals`.
+
     Attributes
     ----------
     x_mm : float
         Stage position in millimetres (folder name).
-    df : pandas.DataFrame
-        DataFrame with at least columns ['NT', 'NR', 'NTR', 'g2(0)'].
-        Additional columns (e.g. 'N_acc', 'N_true') can be added later.
+    columns : dict of str -> np.ndarray
+        One array per CSV column, at least 'NT', 'NR', 'NTR', 'g2(0)'.
     measurement_time_s : float
         Duration of each acquisition interval (seconds).
     window_ns : float
@@ -32,7 +50,7 @@ class PositionData:
         Path to the folder containing HBT_2D.csv and infoMedicion.txt.
     """
     x_mm: float
-    df: pd.DataFrame
+    columns: Dict[str, np.ndarray]
     measurement_time_s: float
     window_ns: float
     folder_path: Path
@@ -55,14 +73,75 @@ class PositionData:
         df = pd.read_csv(csv_path)
         measurement_time_s, window_ns = read_info_file(info_path)
 
+        return cls.from_frame(x_mm, df, measurement_time_s, window_ns, folder_path)
+
+    @classmethod
+    def from_frame(
+        cls,
+        x_mm: float,
+        df: pd.DataFrame,
+        measurement_time_s: float,
+        window_ns: float,
+        folder_path: Path,
+    ) -> "PositionData":
+        """Build a PositionData from a DataFrame (integer columns are narrowed)."""
         return cls(
             x_mm=float(x_mm),
-            df=df,
+            columns={name: narrowest_int(df[name].to_numpy()) for name in df.columns},
             measurement_time_s=measurement_time_s,
             window_ns=window_ns,
             folder_path=folder_path,
         )
 
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The columns as a DataFrame (built on each access, sharing the arrays)."""
+        return pd.DataFrame(self.columns, copy=False)
+
+    def accidentals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (N_acc, N_true) per interval, computed on demand:
+
+            N_acc  = NT * NR * tau / T        (tau = window in s, T = interval)
+            N_true = max(NTR - N_acc, 0)
+
+        NT and NR are widened to int64 before the product, so narrow storage
+        dtypes give exactly the same float64 results as int64 columns.
+        """
+        tau = self.window_ns * 1e-9  # ns -> s
+        T = self.measurement_time_s
+        N_acc = self.columns["NT"].astype(np.int64) * self.columns["NR"].astype(np.int64) * tau / T
+        N_true = self.columns["NTR"] - N_acc
+        N_true[N_true < 0] = 0.0
+        return N_acc, N_true
+
+
+def pack_positions(positions: Sequence[PositionData]) -> Dict[str, np.ndarray]:
+    """
+    Concatenate every position's columns into one shared array per column
+    (positions in order) and rebind each position's columns to views of it.
+
+    Integer columns get the narrowest dtype holding the whole scan, so the
+    dataset costs one small array per column instead of one DataFrame per
+    position. Returns the shared columns.
+    """
+    if not positions:
+        return {}
+    names = list(positions[0].columns)
+    shared = {name: narrowest_int(np.concatenate([p.columns[name] for p in positions])) for name in names}
+    start = 0
+    for p in positions:
+        stop = start + len(p)
+        p.columns = {name: shared[name][start:stop] for name in names}
+        start = stop
+    return shared
+
 
 def read_info_file(info_path: Path) -> Tuple[float, float]:
     """
@@ -124,14 +203,36 @@ class DoubleSlitDataset:
     def __init__(self, config: ExperimentConfig):
         self.config = config
         self.positions: List[PositionData] = []
+        # shared column arrays the positions' columns are views of (see pack_positions)
+        self.columns: Dict[str, np.ndarray] = {}
         self.summary: pd.DataFrame | None = None
 
     def load_positions(self) -> None:
         """
         Scan data_base_dir for numeric-named folders, create PositionData
         for each, and store them sorted by x_mm.
+
+        The positions' columns end up as views of ``self.columns`` (one
+        compact array per column for the whole scan, see :func:`pack_positions`).
+
+        Folders are read by ``config.load_workers`` threads (the per-file cost
+        is mostly I/O and pandas' C parser, which release the GIL).
+
+        If ``config.scan_store`` is set, the positions are memory-mapped from
+        that single columnar file when it is up to date with the folders
+        (see :mod:`double_slit.store`); otherwise they are read from the
+        folders and the store is (re)written for the next run.
         """
+        from .store import load_positions_from_store, write_scan_store
+
         base = self.config.data_base_dir
+        store = self.config.scan_store
+        if store is not None and base.exists():
+            cached = load_positions_from_store(store, base)
+            if cached is not None:
+                self.positions, self.columns = cached
+                return
+
         if not base.exists():
             raise FileNotFoundError(f"Data base dir does not exist: {base}")
 
@@ -151,12 +252,18 @@ class DoubleSlitDataset:
         # Sort by numeric x_mm
         position_dirs.sort(key=lambda tpl: tpl[0])
 
-        positions: List[PositionData] = []
-        for x_mm, folder_path in position_dirs:
-            pos = PositionData.from_folder(folder_path, x_mm)
-            positions.append(pos)
+        workers = max(1, int(self.config.load_workers or 1))
+        if workers > 1 and len(position_dirs) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(position_dirs))) as ex:
+                positions = list(ex.map(lambda tpl: PositionData.from_folder(tpl[1], tpl[0]), position_dirs))
+        else:
+            positions = [PositionData.from_folder(folder_path, x_mm) for x_mm, folder_path in position_dirs]
 
+        self.columns = pack_positions(positions)
         self.positions = positions
 
+        if store is not None:
+            write_scan_store(store, positions, base)
+
     def __len__(self) -> int:
         return len(self.positions)
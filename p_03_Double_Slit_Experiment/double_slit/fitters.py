@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -29,11 +30,93 @@ class FitResult:
         defined as the position of the maximum N_mean in the summary.
     mask : np.ndarray
         Boolean mask indicating which points were actually used in the fit.
+    nfev : int or None
+        Number of residual evaluations (optimizer iterations) curve_fit used.
+    chi2 : float or None
+        Weighted sum of squared residuals at the best fit.
+    status : int or None
+        least_squares termination status (1-4: a tolerance was met).
+    at_bound : tuple of str
+        Parameters sitting on one of their bounds (an active constraint, so
+        not a free local minimum in those parameters).
     """
     params: Dict[str, float]
     cov: np.ndarray
     x0_mm: float
     mask: np.ndarray
+    nfev: int | None = None
+    chi2: float | None = None
+    status: int | None = None
+    at_bound: Tuple[str, ...] = ()
+
+    @property
+    def converged(self) -> bool:
+        """A tolerance was met and no parameter is stuck on a bound."""
+        return self.status is not None and self.status > 0 and not self.at_bound
+
+
+@dataclass
+class FitProblem:
+    """
+    Data and settings of one fit, as prepared by ``DoubleSlitFitter.prepare``.
+
+    Attributes
+    ----------
+    x, y, sigma : np.ndarray
+        Fitted points: position relative to x0_mm (mm), N_mean and its
+        (non-zero) standard error.
+    p0 : list of float
+        Default initial guess.
+    bounds : (list, list)
+        Lower and upper parameter bounds.
+    param_names : list of str
+        Parameter names, in curve_fit order.
+    extended : bool
+        Extended (True) or basic Eq. (9) model.
+    x0_mm : float
+        Estimated center of the pattern (mm).
+    mask : np.ndarray
+        Which summary rows are fitted.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    sigma: np.ndarray
+    p0: List[float]
+    bounds: Tuple[List[float], List[float]]
+    param_names: List[str]
+    extended: bool
+    x0_mm: float
+    mask: np.ndarray
+
+
+@dataclass
+class MultiStartResult:
+    """
+    Result of ``DoubleSlitFitter.fit_counts_multistart``.
+
+    Attributes
+    ----------
+    best : FitResult
+        Lowest-chi^2 converged fit (``minima[0]``); if no start converged, the
+        lowest-chi^2 bound-limited fit (check ``best.converged``).
+    minima : list of FitResult
+        Distinct converged local minima (no parameter on a bound), sorted by chi^2.
+    at_bound : list of FitResult
+        Distinct solutions stopped on a parameter bound, sorted by chi^2
+        (see ``FitResult.at_bound``); flagged, not counted as minima.
+    starts : np.ndarray
+        Initial guesses, shape (n_starts, n_params); row 0 is the default guess.
+    n_converged : int
+        Number of starts whose fit converged (``FitResult.converged``).
+    n_failed : int
+        Number of starts where curve_fit raised.
+    """
+    best: FitResult
+    minima: List[FitResult]
+    at_bound: List[FitResult]
+    starts: np.ndarray
+    n_converged: int
+    n_failed: int
 
 
 class DoubleSlitFitter:
@@ -87,21 +170,12 @@ class DoubleSlitFitter:
             return np.ones_like(x_mm, dtype=bool)
 
     # --------------------------------------------------------------
-    # Main fitting method
+    # Helper: fit problem (data, initial guess, bounds)
     # --------------------------------------------------------------
-    def fit_counts(self, summary: pd.DataFrame) -> FitResult:
+    def prepare(self, summary: pd.DataFrame) -> FitProblem:
         """
-        Fit Eq. (9) (basic or extended) to the mean coincidences in 'summary'.
-
-        Uses:
-            x_mm  = summary["x_mm"]
-            y     = summary["N_mean"]
-            sigma = summary["N_sem"]
-
-        Returns
-        -------
-        FitResult
-            Contains best-fit parameters, covariance, estimated center, and mask.
+        Select the points to fit and build the default initial guess and
+        bounds for the basic or extended model (config.use_extended_model).
         """
         x_mm = summary["x_mm"].to_numpy()
         y = summary["N_mean"].to_numpy()
@@ -117,14 +191,8 @@ class DoubleSlitFitter:
         y_fit = y[mask]
         sigma_fit = sigma[mask]
 
-        # 3) Build model function for curve_fit, depending on config.use_extended_model
+        # 3) Initial guesses and bounds, depending on config.use_extended_model
         if self.config.use_extended_model:
-            def model_for_fit(x_rel_local, N0, V, delta, x_scale, N_bg):
-                return self.model.counts_extended(
-                    x_rel_local, N0, V, delta, x_scale, N_bg
-                )
-
-            # Initial guesses
             N0_guess = float(np.max(y_fit) - np.min(y_fit))
             V_guess = 0.5       # moderate visibility
             delta_guess = 0.0
@@ -138,9 +206,6 @@ class DoubleSlitFitter:
             )
             param_names = ["N0", "V", "delta", "x_scale", "N_bg"]
         else:
-            def model_for_fit(x_rel_local, N0, V, delta):
-                return self.model.counts_basic(x_rel_local, N0, V, delta)
-
             N0_guess = float(np.max(y_fit) - np.min(y_fit))
             V_guess = 0.5
             delta_guess = 0.0
@@ -158,21 +223,224 @@ class DoubleSlitFitter:
         sigma_nonzero = sigma_fit.copy()
         sigma_nonzero[sigma_nonzero == 0.0] = np.min(sigma_nonzero[sigma_nonzero > 0.0])
 
-        popt, pcov = curve_fit(
-            model_for_fit,
-            x_fit,
-            y_fit,
-            p0=p0,
+        return FitProblem(
+            x=x_fit,
+            y=y_fit,
             sigma=sigma_nonzero,
-            absolute_sigma=True,
+            p0=p0,
             bounds=bounds,
+            param_names=param_names,
+            extended=self.config.use_extended_model,
+            x0_mm=x0_mm,
+            mask=mask,
         )
 
-        params = {name: float(val) for name, val in zip(param_names, popt)}
+    # --------------------------------------------------------------
+    # Main fitting method
+    # --------------------------------------------------------------
+    def fit_counts(self, summary: pd.DataFrame) -> FitResult:
+        """
+        Fit Eq. (9) (basic or extended) to the mean coincidences in 'summary'.
 
-        return FitResult(
-            params=params,
-            cov=pcov,
-            x0_mm=x0_mm,
-            mask=mask,
+        Uses:
+            x_mm  = summary["x_mm"]
+            y     = summary["N_mean"]
+            sigma = summary["N_sem"]
+
+        Returns
+        -------
+        FitResult
+            Contains best-fit parameters, covariance, estimated center, and mask.
+        """
+        problem = self.prepare(summary)
+        return _fit_from_start(self.model, self.config.analytic_jacobian, problem, problem.p0)
+
+    # --------------------------------------------------------------
+    # Multi-start fitting
+    # --------------------------------------------------------------
+    def initial_guesses(self, problem: FitProblem, n_starts: int, method: str = "lhs", seed: int = 0) -> np.ndarray:
+        """
+        Initial guesses for a multi-start fit, shape (n, n_params).
+
+        Row 0 is the default guess. The others spread V, delta (and x_scale
+        for the extended model) over their bounds, either on a regular grid
+        (cell centres, k points per parameter with k^d >= n_starts - 1) or as
+        a Latin hypercube of n_starts - 1 points drawn with ``seed``. N0 and
+        N_bg keep their data-driven guesses (their upper bounds are infinite).
+        """
+        p0 = np.asarray(problem.p0, dtype=float)
+        lower, upper = (np.asarray(b, dtype=float) for b in problem.bounds)
+        dims = [problem.param_names.index(name) for name in ("V", "delta", "x_scale") if name in problem.param_names]
+        n_extra = max(0, n_starts - 1)
+        d = len(dims)
+
+        method = method.lower()
+        if method == "grid":
+            k = int(np.ceil(n_extra ** (1.0 / d))) if n_extra else 0
+            centres = (np.arange(k) + 0.5) / k if k else np.empty(0)
+            unit = np.array(np.meshgrid(*[centres] * d, indexing="ij")).reshape(d, -1).T
+        elif method == "lhs":
+            rng = np.random.default_rng(seed)
+            # one point per stratum in every dimension, strata shuffled per dimension
+            strata = np.array([rng.permutation(n_extra) for _ in range(d)]).T
+            unit = (strata + rng.random((n_extra, d))) / max(n_extra, 1)
+        else:
+            raise ValueError(f"Unknown multi-start method {method!r} (use 'grid' or 'lhs')")
+
+        starts = np.repeat(p0[None, :], 1 + len(unit), axis=0)
+        starts[1:, dims] = lower[dims] + unit * (upper[dims] - lower[dims])
+        return starts
+
+    def fit_counts_multistart(
+        self,
+        summary: pd.DataFrame,
+        n_starts: int | None = None,
+        method: str | None = None,
+        workers: int | None = None,
+        seed: int | None = None,
+    ) -> MultiStartResult:
+        """
+        Fit from many initial guesses and keep every distinct local minimum.
+
+        The starts come from :meth:`initial_guesses` and are fitted in a
+        process pool (``workers`` processes; 1 = serial). A fit counts as a
+        converged local minimum when least_squares met a tolerance and no
+        parameter ended on a bound; solutions stopped on a bound are kept
+        apart in ``at_bound``. Two fits are the same solution when every
+        parameter differs by less than ``MINIMUM_TOL_SIGMA`` standard errors
+        (delta compared modulo 2π), or by a relative ``MINIMUM_RTOL`` when
+        the standard errors are not finite. Arguments default to the config's
+        multistart, multistart_method, multistart_workers and multistart_seed.
+        With a fixed seed the result is deterministic.
+
+        Returns
+        -------
+        MultiStartResult
+            Best fit, the distinct converged minima and the bound-limited
+            solutions (both sorted by chi^2), and the starts.
+        """
+        cfg = self.config
+        n_starts = cfg.multistart if n_starts is None else n_starts
+        method = cfg.multistart_method if method is None else method
+        workers = cfg.multistart_workers if workers is None else workers
+        seed = cfg.multistart_seed if seed is None else seed
+
+        problem = self.prepare(summary)
+        starts = self.initial_guesses(problem, max(1, n_starts), method, seed)
+        args = [(self.model, cfg.analytic_jacobian, problem, list(p0)) for p0 in starts]
+
+        workers = max(1, int(workers or 1))
+        if workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(args))) as ex:
+                fits = list(ex.map(_try_fit_from_start, args, chunksize=max(1, len(args) // (4 * workers))))
+        else:
+            fits = [_try_fit_from_start(a) for a in args]
+
+        finished = sorted((f for f in fits if f is not None), key=lambda f: f.chi2)
+        if not finished:
+            raise RuntimeError(f"All {len(starts)} multi-start fits failed")
+
+        minima = _distinct([f for f in finished if f.converged])
+        at_bound = _distinct([f for f in finished if not f.converged])
+        return MultiStartResult(
+            best=minima[0] if minima else at_bound[0],
+            minima=minima,
+            at_bound=at_bound,
+            starts=starts,
+            n_converged=sum(f.converged for f in finished),
+            n_failed=len(fits) - len(finished),
         )
+
+
+# tolerance (in parameter standard errors) for two fits to be the same local minimum
+MINIMUM_TOL_SIGMA = 0.1
+# relative tolerance used instead when a standard error is not finite
+MINIMUM_RTOL = 1e-4
+# a parameter within this fraction of its bound range (or of |bound| if infinite) is on the bound
+BOUND_RTOL = 1e-6
+
+
+def _fit_from_start(model: Eq9Model, analytic_jacobian: bool, problem: FitProblem, p0) -> FitResult:
+    """curve_fit of ``problem`` from initial guess ``p0`` (module level, so it pickles)."""
+    x_fit = problem.x
+
+    # Model function for curve_fit. With analytic_jacobian, a fused evaluator
+    # (Eq9Fused) supplies both the values and the exact Jacobian instead of
+    # finite differences.
+    if analytic_jacobian:
+        model_for_fit = model.fused(x_fit, extended=problem.extended)
+        jac = model_for_fit.jac
+    elif problem.extended:
+        def model_for_fit(x_rel_local, N0, V, delta, x_scale, N_bg):
+            return model.counts_extended(
+                x_rel_local, N0, V, delta, x_scale, N_bg
+            )
+        jac = "2-point"
+    else:
+        def model_for_fit(x_rel_local, N0, V, delta):
+            return model.counts_basic(x_rel_local, N0, V, delta)
+        jac = "2-point"
+
+    popt, pcov, info, _, status = curve_fit(
+        model_for_fit,
+        x_fit,
+        problem.y,
+        p0=p0,
+        sigma=problem.sigma,
+        absolute_sigma=True,
+        bounds=problem.bounds,
+        jac=jac,
+        full_output=True,
+    )
+
+    params = {name: float(val) for name, val in zip(problem.param_names, popt)}
+    chi2 = float(np.sum((info["fvec"]) ** 2))
+
+    lower, upper = (np.asarray(b, dtype=float) for b in problem.bounds)
+    span = np.where(np.isfinite(upper - lower), upper - lower, np.maximum(1.0, np.abs(lower)))
+    tol = BOUND_RTOL * span
+    pinned = (popt - lower <= tol) | (upper - popt <= tol)
+
+    return FitResult(
+        params=params,
+        cov=pcov,
+        x0_mm=problem.x0_mm,
+        mask=problem.mask,
+        nfev=int(info["nfev"]),
+        chi2=chi2,
+        status=int(status),
+        at_bound=tuple(n for n, p in zip(problem.param_names, pinned) if p),
+    )
+
+
+def _try_fit_from_start(args) -> FitResult | None:
+    """_fit_from_start for the pool; None if curve_fit fails from this start."""
+    try:
+        return _fit_from_start(*args)
+    except (RuntimeError, ValueError):
+        return None
+
+
+def _same_minimum(a: FitResult, b: FitResult) -> bool:
+    with np.errstate(invalid="ignore"):
+        err = np.sqrt(np.diag(b.cov)) if b.cov is not None else np.full(len(b.params), np.nan)
+    for (name, va), vb, e in zip(a.params.items(), b.params.values(), err):
+        diff = va - vb
+        if name == "delta":
+            diff = (diff + np.pi) % (2.0 * np.pi) - np.pi
+        if np.isfinite(e) and e > 0:
+            tol = MINIMUM_TOL_SIGMA * e
+        else:  # no usable error bar: fall back to a relative parameter tolerance
+            tol = MINIMUM_RTOL * max(abs(va), abs(vb), 1e-12)
+        if not abs(diff) <= tol:
+            return False
+    return True
+
+
+def _distinct(fits: List[FitResult]) -> List[FitResult]:
+    """Keep the first (lowest chi^2) fit of each group of equivalent solutions."""
+    kept: List[FitResult] = []
+    for fit in fits:
+        if not any(_same_minimum(fit, k) for k in kept):
+            kept.append(fit)
+    return kept
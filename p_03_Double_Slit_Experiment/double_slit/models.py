@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Tuple
 
 import numpy as np
 
@@ -103,6 +104,44 @@ class Eq9Model:
 
         return N_bg + N0 * envelope * interference
 
+    # ------------------------------------------------------------------
+    # Analytic derivatives (used as curve_fit Jacobians)
+    # ------------------------------------------------------------------
+    def phase_per_mm(self) -> Tuple[float, float]:
+        """
+        (alpha/x, beta/x) in rad per mm, i.e. π d / (λ L) and π b / (λ L)
+        with the mm -> m conversion folded in.
+        """
+        lam_L = self.config.wavelength_m * self.config.L_m
+        return np.pi * self.config.d_m * 1e-3 / lam_L, np.pi * self.config.b_m * 1e-3 / lam_L
+
+    def counts_basic_jac(self, x_mm: np.ndarray, N0: float, V: float, delta: float) -> np.ndarray:
+        """
+        Jacobian of :meth:`counts_basic` w.r.t. (N0, V, delta), shape (n, 3).
+        """
+        return self.fused(x_mm, extended=False).value_and_jac((N0, V, delta))[1].copy()
+
+    def counts_extended_jac(
+        self,
+        x_mm: np.ndarray,
+        N0: float,
+        V: float,
+        delta: float,
+        x_scale: float,
+        N_bg: float,
+    ) -> np.ndarray:
+        """
+        Jacobian of :meth:`counts_extended` w.r.t.
+        (N0, V, delta, x_scale, N_bg), shape (n, 5).
+        """
+        params = (N0, V, delta, x_scale, N_bg)
+        return self.fused(x_mm, extended=True).value_and_jac(params)[1].copy()
+
+    def fused(self, x_mm: np.ndarray, extended: bool) -> "Eq9Fused":
+        """Fused value + Jacobian evaluator at fixed positions x_mm (see :class:`Eq9Fused`)."""
+        k_alpha, k_beta = self.phase_per_mm()
+        return Eq9Fused(np.asarray(x_mm, dtype=float), k_alpha, k_beta, extended)
+
     # ------------------------------------------------------------------
     # Optional: theoretical visibility (Eq. (10) in the PDF)
     # ------------------------------------------------------------------
@@ -129,3 +168,105 @@ class Eq9Model:
 
         argument = (np.pi * d * w0 / (lam * z)) ** 2
         return float(np.exp(-argument))
+
+
+def _sinc_and_slope(beta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    sin(beta)/beta and its derivative (beta cos beta - sin beta)/beta^2,
+    using the series -beta/3 near beta = 0.
+    """
+    sinc = np.sinc(beta / np.pi)
+    small = np.abs(beta) < 1e-4
+    safe = np.where(small, 1.0, beta)
+    slope = np.where(small, -beta / 3.0, (np.cos(beta) - sinc) / safe)
+    return sinc, slope
+
+
+@dataclass
+class Eq9Fused:
+    """
+    Eq. (9) and its Jacobian evaluated together at fixed positions.
+
+    Everything that depends only on x (alpha/x_scale, beta/x_scale and, for
+    the basic model, the whole envelope and phase) is computed once at
+    construction; each call then shares sin/cos/sinc between the value and
+    the derivatives. The last (params -> value, jac) is cached, so the
+    ``f(x, *p)`` / ``jac(x, *p)`` pair that curve_fit calls at the same
+    parameters costs one evaluation:
+
+        fused = model.fused(x_fit, extended=True)
+        curve_fit(fused, x_fit, y_fit, p0, jac=fused.jac, ...)
+
+    Parameters are (N0, V, delta) for the basic model and
+    (N0, V, delta, x_scale, N_bg) for the extended one. Values agree with
+    ``counts_basic`` / ``counts_extended`` to rounding.
+
+    Attributes
+    ----------
+    x_mm : np.ndarray
+        Positions (mm) the evaluator is bound to; calls must pass the same x.
+    k_alpha, k_beta : float
+        alpha/x and beta/x in rad per mm (see ``Eq9Model.phase_per_mm``).
+    extended : bool
+        Extended (5 parameters) or basic (3 parameters) model.
+    """
+
+    x_mm: np.ndarray
+    k_alpha: float
+    k_beta: float
+    extended: bool
+    n_evals: int = field(default=0, init=False)
+    _two_alpha: np.ndarray = field(init=False, repr=False)
+    _beta: np.ndarray = field(init=False, repr=False)
+    _envelope: np.ndarray | None = field(default=None, init=False, repr=False)
+    _last: tuple | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._two_alpha = 2.0 * self.k_alpha * self.x_mm
+        self._beta = self.k_beta * self.x_mm
+        if not self.extended:  # no x_scale: the envelope never changes
+            self._envelope = np.sinc(self._beta / np.pi) ** 2
+
+    def value_and_jac(self, params) -> Tuple[np.ndarray, np.ndarray]:
+        """(N(x), dN/dparams of shape (n, n_params)) at ``params``."""
+        params = tuple(float(p) for p in params)
+        if self._last is not None and self._last[0] == params:
+            return self._last[1], self._last[2]
+        self.n_evals += 1
+
+        if self.extended:
+            N0, V, delta, x_scale, N_bg = params
+            sinc, slope = _sinc_and_slope(x_scale * self._beta)
+            envelope = sinc * sinc
+            phase = x_scale * self._two_alpha + delta
+        else:
+            N0, V, delta = params
+            N_bg = 0.0
+            envelope = self._envelope
+            phase = self._two_alpha + delta
+
+        cos_p, sin_p = np.cos(phase), np.sin(phase)
+        interference = 0.5 * (1.0 + V * cos_p)
+        d_interf_dphase = -0.5 * V * sin_p
+
+        jac = np.empty((self.x_mm.size, len(params)))
+        jac[:, 0] = envelope * interference
+        jac[:, 1] = N0 * envelope * 0.5 * cos_p
+        jac[:, 2] = N0 * envelope * d_interf_dphase
+        if self.extended:
+            # x_scale enters both beta' = x_scale*beta and 2 alpha' = x_scale*2 alpha
+            d_env = 2.0 * sinc * slope * self._beta
+            jac[:, 3] = N0 * (d_env * interference + envelope * d_interf_dphase * self._two_alpha)
+            jac[:, 4] = 1.0
+
+        value = N_bg + N0 * jac[:, 0]
+        self._last = (params, value, jac)
+        return value, jac
+
+    def __call__(self, x_mm: np.ndarray, *params: float) -> np.ndarray:
+        """Model values, with curve_fit's f(x, *params) signature."""
+        return self.value_and_jac(params)[0]
+
+    def jac(self, x_mm: np.ndarray, *params: float) -> np.ndarray:
+        """Jacobian, with curve_fit's jac(x, *params) signature."""
+        return self.value_and_jac(params)[1]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 import pandas as pd
@@ -12,7 +12,9 @@ import matplotlib.pyplot as plt
 
 from .config import ExperimentConfig
 from .models import Eq9Model
-from .fitters import FitResult
+
+if TYPE_CHECKING:
+    from .fitters import FitResult
 
 
 @dataclass
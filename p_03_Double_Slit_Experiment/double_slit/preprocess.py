@@ -25,7 +25,10 @@ class CoincidencePreprocessor:
 
     def subtract_accidentals(self, pos: PositionData) -> None:
         """
-        Add columns 'N_acc' and 'N_true' to pos.df, if they are not present.
+        Add columns 'N_acc' and 'N_true' to pos.columns, if they are not present.
+
+        Only needed to keep the derived columns around: the statistics below
+        compute them on demand (``PositionData.accidentals``) without storing.
 
         N_acc = (NT * NR * tau) / T
             where:
@@ -34,20 +37,12 @@ class CoincidencePreprocessor:
                 T     : measurement_time_s (seconds)
         N_true = NTR - N_acc
         """
-        df = pos.df
-
         # If already computed, don't do it again
-        if "N_acc" in df.columns and "N_true" in df.columns:
+        if "N_acc" in pos.columns and "N_true" in pos.columns:
             return
 
-        T = pos.measurement_time_s
-        tau = pos.window_ns * 1e-9  # ns -> s
-
-        df["N_acc"] = df["NT"] * df["NR"] * tau / T
-        df["N_true"] = df["NTR"] - df["N_acc"]
-
-        # Optional: avoid negative values from fluctuations
-        df.loc[df["N_true"] < 0, "N_true"] = 0.0
+        # N_true is clipped at 0 to avoid negative values from fluctuations
+        pos.columns["N_acc"], pos.columns["N_true"] = pos.accidentals()
 
     def compute_summary_for_position(self, pos: PositionData) -> Dict[str, Any]:
         """
@@ -60,20 +55,17 @@ class CoincidencePreprocessor:
             g2_mean, g2_std, g2_sem,
             n_intervals
         """
-        df = pos.df
-        n = len(df)
+        n = len(pos)
 
         # Always have access to raw coincidences
-        NTR = df["NTR"].to_numpy()
+        NTR = pos["NTR"]
         N_mean_raw = float(np.mean(NTR))
         N_total_raw = float(np.sum(NTR))
 
         # Decide which coincidences to use for the interference pattern
         if self.config.use_true_coincidences:
-            # Make sure N_true exists
-            if "N_true" not in df.columns:
-                self.subtract_accidentals(pos)
-            N = df["N_true"].to_numpy()
+            # Use stored N_true if subtract_accidentals was called, else compute it
+            N = pos["N_true"] if "N_true" in pos.columns else pos.accidentals()[1]
         else:
             N = NTR
 
@@ -83,7 +75,7 @@ class CoincidencePreprocessor:
         N_total = float(np.sum(N))
 
         # g2(0) from acquisition (already normalized in their definition)
-        g2_vals = df["g2(0)"].to_numpy()
+        g2_vals = pos["g2(0)"]
         g2_mean = float(np.mean(g2_vals))
         g2_std = float(np.std(g2_vals, ddof=1)) if n > 1 else 0.0
         g2_sem = g2_std / np.sqrt(n) if n > 0 else 0.0
@@ -105,19 +97,141 @@ class CoincidencePreprocessor:
         }
 
 
-def build_summary(dataset: DoubleSlitDataset, preproc: CoincidencePreprocessor) -> pd.DataFrame:
+def _segment_sums(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Per-segment sums of ``values`` split at ``starts`` (all segments non-empty),
+    as one ``np.add.reduceat``. Integer sums are exact (int64 accumulator).
+    Float sums are sequential, whereas np.sum/np.mean use pairwise summation,
+    so they can differ from the per-position loop in the last bits (a few ulp).
+    """
+    if values.dtype.kind in "iub":
+        return np.add.reduceat(values, starts, dtype=np.int64).astype(float)
+    return np.add.reduceat(np.asarray(values, dtype=float), starts)
+
+
+def _segment_mean_std(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray):
+    """Per-segment (mean, std with ddof=1), two-pass like np.mean/np.std."""
+    values = np.asarray(values, dtype=float)
+    mean = _segment_sums(values, starts) / lengths
+    dev = values - np.repeat(mean, lengths)
+    np.multiply(dev, dev, out=dev)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.where(lengths > 1, np.sqrt(_segment_sums(dev, starts) / (lengths - 1)), 0.0)
+    return mean, std
+
+
+def summarize_positions(
+    positions,
+    preproc: CoincidencePreprocessor,
+    columns: Dict[str, np.ndarray] | None = None,
+) -> pd.DataFrame:
     """
-    Loop over all PositionData in the dataset, compute statistics,
-    and return a summary DataFrame with one row per x_mm.
+    Grouped version of ``compute_summary_for_position`` for all positions.
+
+    Every position's NT/NR/NTR/g2(0) is concatenated into one long array
+    (segments in position order), accidentals are subtracted for all rows at
+    once, and the statistics are ``np.add.reduceat`` segment reductions over
+    that array, so there is no Python work per row or per position beyond
+    reading its metadata. Output rows have the same columns as the
+    per-position function; integer totals and counts are identical, float
+    statistics agree to a few ulp (sequential vs pairwise summation, see
+    :func:`_segment_sums`).
+    Unlike ``subtract_accidentals``, the positions are not modified.
+
+    ``columns`` may give the already concatenated columns (the dataset's
+    shared block, see ``pack_positions``) to skip the concatenation.
+    """
+    n_pos = len(positions)
+    lengths = np.array([len(p) for p in positions], dtype=np.int64)
+    T = np.array([p.measurement_time_s for p in positions], dtype=float)
+    window_ns = np.array([p.window_ns for p in positions], dtype=float)
+    x_mm = np.array([p.x_mm for p in positions], dtype=float)
+
+    def column(name: str) -> np.ndarray:
+        if columns is not None:
+            return columns[name]
+        return np.concatenate([p[name] for p in positions]) if n_pos else np.array([])
+
+    NTR = column("NTR")
+    g2_vals = column("g2(0)")
+
+    if preproc.config.use_true_coincidences:
+        tau = window_ns * 1e-9  # ns -> s
+        # same element-wise steps as subtract_accidentals: NT*NR*tau/T, NTR - N_acc, clip at 0
+        NT, NR = column("NT").astype(np.int64), column("NR").astype(np.int64)
+        N_acc = NT * NR * np.repeat(tau, lengths) / np.repeat(T, lengths)
+        N = NTR - N_acc
+        N[N < 0] = 0.0
+    else:
+        N = NTR
+
+    # empty positions: reduceat needs non-empty segments, fill them like np.mean/np.sum would
+    full = lengths > 0
+    n_full = lengths[full]
+    starts = np.cumsum(lengths)[full] - n_full
+
+    def per_position(values_full, empty_value):
+        out = np.full(n_pos, empty_value, dtype=float)
+        out[full] = values_full
+        return out
+
+    N_mean, N_std = _segment_mean_std(N, starts, n_full)
+    g2_mean, g2_std = _segment_mean_std(g2_vals, starts, n_full)
+    N_total_raw = _segment_sums(NTR, starts)
+    sqrt_n = np.sqrt(n_full)
+
+    summary = pd.DataFrame({
+        "x_mm": x_mm,
+        "dt_s": T,
+        "window_ns": window_ns,
+        "N_mean": per_position(N_mean, np.nan),
+        "N_std": per_position(N_std, 0.0),
+        "N_sem": per_position(N_std / sqrt_n, 0.0),
+        "N_total": per_position(_segment_sums(N, starts), 0.0),
+        "N_mean_raw": per_position(N_total_raw / n_full, np.nan),
+        "N_total_raw": per_position(N_total_raw, 0.0),
+        "g2_mean": per_position(g2_mean, np.nan),
+        "g2_std": per_position(g2_std, 0.0),
+        "g2_sem": per_position(g2_std / sqrt_n, 0.0),
+        "n_intervals": lengths,
+    })
+    return summary
 
-    Also stores the DataFrame in dataset.summary.
+
+def build_summary(
+    dataset: DoubleSlitDataset,
+    preproc: CoincidencePreprocessor,
+    grouped: bool = True,
+) -> pd.DataFrame:
     """
-    rows: List[dict] = []
+    Compute statistics for all PositionData in the dataset and return a
+    summary DataFrame with one row per x_mm.
 
-    for pos in dataset.positions:
-        stats = preproc.compute_summary_for_position(pos)
-        rows.append(stats)
+    grouped=True uses the vectorized :func:`summarize_positions`; False loops
+    over ``compute_summary_for_position``. Both give the same summary up to
+    float rounding (a few ulp, see :func:`summarize_positions`).
 
-    summary = pd.DataFrame(rows).sort_values("x_mm").reset_index(drop=True)
+    Also stores the DataFrame in dataset.summary.
+    """
+    if grouped:
+        positions, shared = dataset.positions, dataset.columns
+        # the shared block is only valid while it still backs exactly these positions
+        packed = (
+            bool(shared) and bool(positions)
+            and len(shared["NTR"]) == sum(len(p) for p in positions)
+            and all(np.shares_memory(p["NTR"], shared["NTR"]) for p in (positions[0], positions[-1]))
+        )
+        columns = shared if packed else None
+        summary = summarize_positions(positions, preproc, columns)
+    else:
+        rows: List[dict] = []
+
+        for pos in dataset.positions:
+            stats = preproc.compute_summary_for_position(pos)
+            rows.append(stats)
+
+        summary = pd.DataFrame(rows)
+
+    summary = summary.sort_values("x_mm").reset_index(drop=True)
     dataset.summary = summary
     return summary
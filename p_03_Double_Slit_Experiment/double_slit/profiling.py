@@ -0,0 +1,134 @@
+# double_slit/profiling.py
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List
+
+_NULL = nullcontext()
+
+
+@dataclass
+class StageProfiler:
+    """
+    Wall-time and tracemalloc-peak instrumentation of pipeline stages.
+
+    Disabled by default: ``stage()`` then returns a shared no-op context
+    manager and ``timed()`` leaves functions untouched, so the calls can stay
+    in the pipeline at no cost.
+
+    Stages nest and are keyed by their stack path (``"fit;curve_fit"``);
+    repeated stages accumulate calls and time and keep the largest peak.
+
+    Attributes
+    ----------
+    enabled : bool
+        Record anything at all.
+    memory : bool
+        Also trace memory peaks with tracemalloc (slows allocation-heavy code).
+    """
+
+    enabled: bool = False
+    memory: bool = True
+    records: Dict[str, dict] = field(default_factory=dict)
+    _stack: List[list] = field(default_factory=list, repr=False)
+    _owns_tracing: bool = field(default=False, repr=False)
+
+    def stage(self, name: str):
+        """Context manager timing the block as stage ``name``."""
+        return self._stage(name) if self.enabled else _NULL
+
+    def timed(self, name: str | None = None) -> Callable:
+        """Decorator version of :meth:`stage` (defaults to the function's qualname)."""
+        def deco(fn):
+            if not self.enabled:
+                return fn
+            label = name or fn.__qualname__
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self._stage(label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    @contextmanager
+    def _stage(self, name: str):
+        memory = self.memory
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            if self._stack:  # keep the parent's peak so far before resetting it
+                self._stack[-1][3] = max(self._stack[-1][3], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = [name, time.perf_counter(), 0.0, 0]
+        self._stack.append(frame)
+        path = ";".join(f[0] for f in self._stack)
+        rec = self.records.setdefault(
+            path, {"calls": 0, "seconds": 0.0, "child_seconds": 0.0, "peak_bytes": 0}
+        )
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            peak = max(frame[3], tracemalloc.get_traced_memory()[1]) if memory else 0
+            self._stack.pop()
+            rec["calls"] += 1
+            rec["seconds"] += elapsed
+            rec["child_seconds"] += frame[2]
+            rec["peak_bytes"] = max(rec["peak_bytes"], peak)
+            if self._stack:
+                self._stack[-1][2] += elapsed
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            elif self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def report(self) -> List[dict]:
+        """One dict per stage (in start order) with total/self seconds and peak bytes."""
+        return [
+            {
+                "stage": path,
+                "depth": path.count(";"),
+                "calls": r["calls"],
+                "seconds": r["seconds"],
+                "self_seconds": r["seconds"] - r["child_seconds"],
+                "peak_bytes": r["peak_bytes"],
+            }
+            for path, r in self.records.items()
+        ]
+
+    def folded(self) -> List[str]:
+        """Collapsed-stack lines ``stage;sub <self µs>`` (flamegraph.pl, speedscope)."""
+        return [f"{r['stage']} {max(0, round(r['self_seconds'] * 1e6))}" for r in self.report()]
+
+    def write(self, path: Path | str) -> Path:
+        """
+        Write the JSON report to ``path`` and collapsed stacks
+        (``stage;sub <self µs>``, for flamegraph.pl / speedscope) to ``path.folded``.
+        """
+        path = Path(path)
+        path.write_text(
+            json.dumps({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "stages": self.report()}, indent=2),
+            encoding="utf-8",
+        )
+        path.with_suffix(".folded").write_text("\n".join(self.folded()) + "\n", encoding="utf-8")
+        return path
+
+    def print_summary(self) -> None:
+        for r in self.report():
+            name = r["stage"].rsplit(";", 1)[-1]
+            print(
+                f"{'  ' * r['depth']}{name:<20s} {r['seconds'] * 1e3:10.2f} ms  "
+                f"x{r['calls']:<4d} peak {r['peak_bytes'] / 2**20:8.2f} MiB"
+            )
@@ -0,0 +1,169 @@
+# double_slit/store.py
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+_MAGIC = b"DSSCAN1\n"
+_ALIGN = 64
+_SOURCES = ("HBT_2D.csv", "infoMedicion.txt")
+
+
+def _source_signature(folder: Path) -> List[int]:
+    """[size, mtime_ns] of HBT_2D.csv and infoMedicion.txt, used to detect a stale store."""
+    sig: List[int] = []
+    for name in _SOURCES:
+        st = os.stat(folder / name)
+        sig += [int(st.st_size), int(st.st_mtime_ns)]
+    return sig
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_scan_store(path: Path, positions: Sequence, base_dir: Path) -> Path:
+    """
+    Compile a whole scan into ONE columnar file.
+
+    Layout: magic, 8-byte header length, JSON header, then each column as a
+    contiguous little-endian block (64-byte aligned). Columns are every CSV
+    column (``NT``, ``NR``, ``NTR``, ``g2(0)``, ... in the positions' dtypes)
+    plus ``pos``, the row's position index. The header holds, per position,
+    x_mm, row range, measurement time, window, folder name and the source
+    files' size/mtime.
+
+    Parameters
+    ----------
+    path : Path
+        Output file (written atomically).
+    positions : sequence of PositionData
+        Sorted positions, as produced by ``DoubleSlitDataset.load_positions``.
+    base_dir : Path
+        Folder containing the position subfolders.
+    """
+    path = Path(path)
+    lengths = np.array([len(p) for p in positions], dtype=np.int64)
+    stops = np.cumsum(lengths)
+    starts = stops - lengths
+
+    names = list(positions[0].columns) if len(positions) else []
+    columns: Dict[str, np.ndarray] = {
+        name: np.concatenate([p.columns[name] for p in positions]) for name in names
+    }
+    columns["pos"] = np.repeat(np.arange(len(positions), dtype=np.int32), lengths)
+
+    meta = {
+        "n_rows": int(lengths.sum()),
+        "columns": [],
+        "positions": [
+            {
+                "x_mm": float(p.x_mm),
+                "start": int(a),
+                "stop": int(b),
+                "measurement_time_s": float(p.measurement_time_s),
+                "window_ns": float(p.window_ns),
+                "folder": os.path.relpath(p.folder_path, base_dir),
+                "sources": _source_signature(Path(p.folder_path)),
+            }
+            for p, a, b in zip(positions, starts, stops)
+        ],
+    }
+
+    blocks = [(name, np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("<"))) for name, arr in columns.items()]
+    meta["columns"] = [{"name": name, "dtype": arr.dtype.str, "offset": 0} for name, arr in blocks]
+
+    # column offsets are stored in the header, so iterate until its length is stable
+    header_len = -1
+    while True:
+        header = json.dumps(meta).encode("utf-8")
+        new_len = _aligned(len(_MAGIC) + 8 + len(header))
+        if new_len == header_len:
+            break
+        header_len = offset = new_len
+        for entry, (_, arr) in zip(meta["columns"], blocks):
+            entry["offset"] = offset
+            offset = _aligned(offset + arr.nbytes)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_MAGIC)
+        fh.write(len(header).to_bytes(8, "little"))
+        fh.write(header)
+        for entry, (_, arr) in zip(meta["columns"], blocks):
+            fh.seek(entry["offset"])
+            fh.write(arr.tobytes())
+        fh.truncate(offset)
+    os.replace(tmp, path)
+    return path
+
+
+def read_scan_store(path: Path) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """
+    Open a scan store: (header, {column: read-only np.memmap}).
+    Nothing but the header is read until the columns are accessed.
+    """
+    with open(path, "rb") as fh:
+        if fh.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a scan store")
+        n = int.from_bytes(fh.read(8), "little")
+        meta = json.loads(fh.read(n).decode("utf-8"))
+    n_rows = meta["n_rows"]
+    columns = {
+        c["name"]: np.memmap(path, dtype=np.dtype(c["dtype"]), mode="r", offset=c["offset"], shape=(n_rows,))
+        if n_rows else np.empty(0, dtype=np.dtype(c["dtype"]))
+        for c in meta["columns"]
+    }
+    return meta, columns
+
+
+def load_positions_from_store(path: Path, base_dir: Path) -> Tuple[List, Dict[str, np.ndarray]] | None:
+    """
+    (PositionData list, shared columns) backed by the memory-mapped store, or
+    None if the store is missing or stale (a folder added/removed or a source
+    file changed). Each position's columns are slices of the mapped columns.
+    """
+    from .dataio import PositionData
+
+    path = Path(path)
+    if not path.exists():
+        return None
+    meta, columns = read_scan_store(path)
+
+    folders = sorted(e.name for e in base_dir.iterdir() if e.is_dir() and _is_number(e.name))
+    if folders != sorted(p["folder"] for p in meta["positions"]):
+        return None
+    for p in meta["positions"]:
+        try:
+            if _source_signature(base_dir / p["folder"]) != p["sources"]:
+                return None
+        except FileNotFoundError:
+            return None
+
+    shared = {c["name"]: columns[c["name"]] for c in meta["columns"] if c["name"] != "pos"}
+    positions = []
+    for p in meta["positions"]:
+        a, b = p["start"], p["stop"]
+        positions.append(
+            PositionData(
+                x_mm=p["x_mm"],
+                columns={name: arr[a:b] for name, arr in shared.items()},
+                measurement_time_s=p["measurement_time_s"],
+                window_ns=p["window_ns"],
+                folder_path=base_dir / p["folder"],
+            )
+        )
+    return positions, shared
+
+
+def _is_number(name: str) -> bool:
+    try:
+        float(name)
+        return True
+    except ValueError:
+        return False
@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
+import argparse
+
 from double_slit import make_default_config, DoubleSlitAnalysis
+from double_slit.profiling import StageProfiler
 
 
-def main():
+def main(
+    profile_path: str | None = None,
+    plots: bool = True,
+    tables_only: bool = False,
+    multistart: int = 0,
+    seed: int = 0,
+):
     # 1) Build default config (edit physical parameters inside config.py if needed)
     config = make_default_config()
 
@@ -15,15 +24,56 @@ def main():
     config.use_extended_model = True      # extended model with x_scale, background
     config.fit_region = "up_to_center"    # e.g. "full", "up_to_center", "around_center"
     config.save_figures = True            # save SVGs into figures/
+    config.scan_store = config.project_root / "samples_scan.dss"  # None = always read the folders
+    config.multistart = multistart        # > 1: fit from that many initial guesses (process pool)
+    config.multistart_seed = seed
+
+    # CLI modes: --no-plots skips figures; --tables-only also skips the fit
+    config.make_plots = plots and not tables_only
+    if tables_only:
+        config.perform_fit = False
 
     # 2) Run analysis
-    analysis = DoubleSlitAnalysis(config)
+    profiler = StageProfiler(enabled=profile_path is not None)
+    analysis = DoubleSlitAnalysis(config, profiler=profiler)
     summary, fit_result = analysis.run_full_analysis()
 
     print("\nSummary head:")
     print(summary.head())
     print(f"\nLoaded {len(summary)} positions.")
 
+    if tables_only:
+        out = config.project_root / "summary.csv"
+        summary.to_csv(out, index=False)
+        print(f"Summary table written to {out}")
+
+    # 3) Optional stage timings / memory peaks
+    if profiler.enabled:
+        profiler.print_summary()
+        print(f"Profile written to {profiler.write(profile_path)}")
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Double-slit coincidence analysis.")
+    parser.add_argument("--no-plots", action="store_true", help="skip figures (matplotlib is never imported)")
+    parser.add_argument(
+        "--tables-only", action="store_true",
+        help="only build the per-position summary and write summary.csv (no fit, no figures)",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const="profile.json", default=None, metavar="JSON",
+        help="write per-stage time/memory to JSON (+ .folded stacks for flamegraphs)",
+    )
+    parser.add_argument(
+        "--multistart", type=int, default=0, metavar="N",
+        help="fit from N initial guesses (Latin hypercube) and list the distinct local minima",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the multi-start guesses")
+    args = parser.parse_args()
+    main(
+        args.profile,
+        plots=not args.no_plots,
+        tables_only=args.tables_only,
+        multistart=args.multistart,
+        seed=args.seed,
+    )
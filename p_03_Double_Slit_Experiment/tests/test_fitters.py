@@ -0,0 +1,73 @@
+# tests/test_fitters.py
+
+"""Multi-start fitting: convergence flags, bound-limited solutions, minimum matching."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from double_slit import make_default_config  # noqa: E402
+from double_slit.dataio import DoubleSlitDataset  # noqa: E402
+from double_slit.fitters import DoubleSlitFitter, FitResult, _same_minimum  # noqa: E402
+from double_slit.models import Eq9Model  # noqa: E402
+from double_slit.preprocess import CoincidencePreprocessor, build_summary  # noqa: E402
+
+
+def _fit(params, cov):
+    return FitResult(params=params, cov=cov, x0_mm=0.0, mask=np.ones(1, dtype=bool), status=1)
+
+
+def test_same_minimum_with_nonfinite_errors():
+    a = _fit({"N0": 10.0, "V": 0.5, "delta": 0.1}, np.full((3, 3), np.inf))
+    b = _fit({"N0": 20.0, "V": 0.2, "delta": 1.0}, np.full((3, 3), np.nan))
+    assert not _same_minimum(a, b)
+    assert not _same_minimum(b, a)
+    assert _same_minimum(a, _fit(dict(a.params), np.full((3, 3), np.inf)))
+
+
+def test_same_minimum_wraps_delta():
+    cov = np.diag([1.0, 0.01, 0.01])
+    a = _fit({"N0": 10.0, "V": 0.5, "delta": 0.1}, cov)
+    b = _fit({"N0": 10.0, "V": 0.5, "delta": 0.1 - 2.0 * np.pi}, cov)
+    assert _same_minimum(a, b)
+
+
+@pytest.fixture(scope="module")
+def sample_fitter():
+    config = make_default_config()
+    if not config.data_base_dir.exists():
+        pytest.skip("no samples/ folder")
+    config.fit_region = "up_to_center"
+    dataset = DoubleSlitDataset(config)
+    dataset.load_positions()
+    return DoubleSlitFitter(config, Eq9Model(config)), build_summary(dataset, CoincidencePreprocessor(config))
+
+
+def test_multistart_flags_bound_solutions(sample_fitter):
+    fitter, summary = sample_fitter
+    result = fitter.fit_counts_multistart(summary, n_starts=16, workers=1, seed=0)
+
+    assert result.best.converged and not result.best.at_bound
+    assert all(m.converged for m in result.minima)
+    assert all(m.at_bound for m in result.at_bound)
+    assert result.n_converged <= len(result.starts) - result.n_failed
+    # the default start's solution is the best one (up to the optimizer tolerance)
+    single = fitter.fit_counts(summary)
+    err = np.sqrt(np.diag(single.cov))
+    for (name, value), e in zip(single.params.items(), err):
+        assert abs(result.best.params[name] - value) < 0.01 * e
+
+
+def test_multistart_pool_matches_serial(sample_fitter):
+    fitter, summary = sample_fitter
+    serial = fitter.fit_counts_multistart(summary, n_starts=8, workers=1, seed=1)
+    pooled = fitter.fit_counts_multistart(summary, n_starts=8, workers=2, seed=1)
+    assert np.array_equal(serial.starts, pooled.starts)
+    assert [m.params for m in serial.minima] == [m.params for m in pooled.minima]
+    assert [m.params for m in serial.at_bound] == [m.params for m in pooled.at_bound]
@@ -0,0 +1,76 @@
+# tests/test_preprocess.py
+
+"""Grouped build_summary vs the per-position loop."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from double_slit import make_default_config  # noqa: E402
+from double_slit.dataio import DoubleSlitDataset, PositionData, pack_positions  # noqa: E402
+from double_slit.preprocess import CoincidencePreprocessor, build_summary  # noqa: E402
+
+# sequential (reduceat) vs pairwise (np.mean/np.std) summation: a few ulp apart
+RTOL = 1e-12
+
+
+def _dataset(use_true: bool, sizes, seed: int = 3) -> DoubleSlitDataset:
+    rng = np.random.default_rng(seed)
+    config = make_default_config()
+    config.use_true_coincidences = use_true
+    dataset = DoubleSlitDataset(config)
+    dataset.positions = [
+        PositionData.from_frame(
+            0.1 * i,
+            pd.DataFrame({
+                "NT": rng.integers(0, 200_000, n),
+                "NR": rng.integers(0, 5_000, n),
+                "NTR": rng.integers(0, 40, n),
+                "g2(0)": 3.0 * rng.random(n),
+            }),
+            0.5 if i % 2 else 0.25,
+            20.0 + i % 3,
+            Path("."),
+        )
+        for i, n in enumerate(sizes)
+    ]
+    return dataset
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")  # np.mean of the empty position
+@pytest.mark.parametrize("use_true", [True, False])
+@pytest.mark.parametrize("packed", [False, True])
+def test_grouped_matches_loop(use_true, packed):
+    sizes = [50, 1, 0, 2, 20_000, 9_000, 8_193, 3] + list(range(1, 300, 7))
+    dataset = _dataset(use_true, sizes)
+    if packed:
+        dataset.columns = pack_positions(dataset.positions)
+    preproc = CoincidencePreprocessor(dataset.config)
+
+    loop = build_summary(dataset, preproc, grouped=False)
+    grouped = build_summary(dataset, preproc, grouped=True)
+
+    pd.testing.assert_frame_equal(grouped, loop, check_exact=False, rtol=RTOL, atol=0.0)
+    exact = ["x_mm", "dt_s", "window_ns", "N_total_raw", "N_mean_raw", "n_intervals"]
+    if not use_true:
+        exact.append("N_total")
+    pd.testing.assert_frame_equal(grouped[exact], loop[exact], check_exact=True)
+
+
+def test_sample_scan_matches_loop():
+    config = make_default_config()
+    if not config.data_base_dir.exists():
+        pytest.skip("no samples/ folder")
+    dataset = DoubleSlitDataset(config)
+    dataset.load_positions()
+    preproc = CoincidencePreprocessor(config)
+    loop = build_summary(dataset, preproc, grouped=False)
+    grouped = build_summary(dataset, preproc, grouped=True)
+    pd.testing.assert_frame_equal(grouped, loop, check_exact=False, rtol=RTOL, atol=0.0)